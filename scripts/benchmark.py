@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark suite for the content toolchain
+Times quiz generation per tense, JSON load/dump per file, the validators'
+per-item throughput and the fixer passes, on the real assets and optionally
+on synthetic N-times-larger copies. Results are compared with a saved
+baseline and the run fails when a stage gets slower than the threshold.
+
+Baselines are machine-specific: save one on the machine that runs the
+comparison.
+
+Usage:
+    python benchmark.py --save-baseline          record the baseline
+    python benchmark.py                          compare against it
+    python benchmark.py --scales 1 10            also run a synthetic 10x dataset
+    python benchmark.py --stages validate/ fix/  only stages with these prefixes
+"""
+import argparse
+import gc
+import platform
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import check_grammar_quiz
+import content_validation
+import fix_grammar_issues
+import fix_remaining_issues
+import generate_grammar_quiz
+import json_codec
+import smart_content_validation
+import validate_app_content
+from quiz_stream import iter_quiz_questions
+
+DATA_DIR = Path(__file__).parent.parent / "assets" / "data"
+BASELINE_PATH = Path(__file__).parent / "benchmark_baseline.json"
+
+DIFFICULTIES = ['easy', 'medium', 'hard']
+
+# Slowdowns smaller than this are treated as timer noise
+MIN_DELTA_SECONDS = 0.005
+
+
+class Suite:
+    """Collects best-of-N timings per stage"""
+
+    def __init__(self, repeat=3, stages=None):
+        self.repeat = repeat
+        self.stages = stages
+        self.results = {}
+
+    def wanted(self, name):
+        return not self.stages or any(name.startswith(prefix) for prefix in self.stages)
+
+    def run(self, name, items, func, setup=None):
+        """Time func() repeat times and keep the fastest run
+
+        Like timeit, the cyclic GC is off while timing; otherwise collections
+        walking the large loaded dataset dominate the allocation-heavy stages.
+        """
+        if not self.wanted(name):
+            return
+        best = None
+        for _ in range(self.repeat):
+            if setup:
+                setup()
+            gc.collect()
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                func()
+                elapsed = time.perf_counter() - start
+            finally:
+                gc.enable()
+            best = elapsed if best is None else min(best, elapsed)
+        self.results[name] = {'items': items, 'seconds': round(best, 6)}
+        print(f"  {name:<58} {items:>9,} items {best:>9.4f}s {items / best if best else 0:>12,.0f}/s")
+
+
+# ===== DATASETS =====
+
+def grow(items, scale):
+    """items repeated scale times, later copies with their ids suffixed"""
+    return [dict(item, id=f"{item.get('id')}_x{copy}") if copy else item
+            for copy in range(scale) for item in items]
+
+
+def write_scaled(src, dest, scale):
+    """Copy an asset file with every array grown scale-fold"""
+    data = json_codec.load(src)
+    if isinstance(data, dict):
+        data = {k: grow(v, scale) if isinstance(v, list) else v for k, v in data.items()}
+    else:
+        data = grow(data, scale)
+    json_codec.dump_pretty(data, dest)
+    return dest
+
+
+def make_dataset(scale, work_dir):
+    """Quiz and vocab files for a scale; scale 1 is the real assets
+
+    Synthetic datasets keep the real file names and shapes with every array
+    repeated scale times.
+    """
+    quiz_files = sorted((DATA_DIR / 'quiz').glob('grammar_quiz_*.json'))
+    vocab_files = sorted(DATA_DIR.glob('vocab_part*.json'))
+    if scale == 1:
+        return quiz_files, vocab_files
+
+    out_dir = Path(work_dir) / f"x{scale}"
+    (out_dir / 'quiz').mkdir(parents=True)
+    return ([write_scaled(src, out_dir / 'quiz' / src.name, scale) for src in quiz_files],
+            [write_scaled(src, out_dir / src.name, scale) for src in vocab_files])
+
+
+def load_records(quiz_files, vocab_files):
+    quizzes = []
+    for path in quiz_files:
+        for difficulty, q in iter_quiz_questions(path):
+            quizzes.append(dict(q, _file=path.name, _difficulty=difficulty))
+    vocab = []
+    for path in vocab_files:
+        vocab.extend(json_codec.load(path))
+    return quizzes, vocab
+
+
+# ===== STAGES =====
+
+def bench_generation(suite, scale):
+    count = 5000 * scale
+    for tense in generate_grammar_quiz.TENSES:
+        def generate(tense=tense):
+            for difficulty, num in generate_grammar_quiz.difficulty_counts(count).items():
+                for index in range(num):
+                    generate_grammar_quiz.generate_question(tense, difficulty, index)
+        suite.run(f"generate/{tense['id']}@x{scale}", count, generate)
+
+
+def bench_json(suite, scale, quiz_files, vocab_files):
+    for path in quiz_files:
+        data = json_codec.load(path)
+        items = sum(len(data.get(d, [])) for d in DIFFICULTIES)
+
+        def load(path=path):
+            json_codec.load(path)
+
+        def stream(path=path):
+            for _ in iter_quiz_questions(path):
+                pass
+
+        def dump(data=data):
+            json_codec.dumps_pretty(data)
+
+        suite.run(f"json_load/{path.name}@x{scale}", items, load)
+        suite.run(f"json_stream/{path.name}@x{scale}", items, stream)
+        suite.run(f"json_dump/{path.name}@x{scale}", items, dump)
+
+    def load_vocab():
+        for path in vocab_files:
+            json_codec.load(path)
+    suite.run(f"json_load/vocab_part*.json@x{scale}", len(vocab_files), load_vocab)
+
+
+def bench_validators(suite, scale, quizzes, vocab):
+    stems = [q.get('stem', '') for q in quizzes]
+
+    for kind, records in [('quiz_question', quizzes), ('vocab_item', vocab)]:
+        suite.run(f"validate/content_validation.{kind}@x{scale}", len(records),
+                  lambda kind=kind, records=records: [content_validation.check_record(kind, r) for r in records])
+
+    suite.run(f"validate/check_grammar_quiz.validate_question@x{scale}", len(quizzes),
+              lambda: [check_grammar_quiz.validate_question(q) for q in quizzes])
+    suite.run(f"validate/fix_grammar_issues.stem_checks@x{scale}", len(stems),
+              lambda: [(fix_grammar_issues.check_phrase_rules(s), fix_grammar_issues.check_capitalization_issues(s))
+                       for s in stems])
+    suite.run(f"validate/fix_grammar_issues.check_phrase_rules@x{scale}", len(stems),
+              lambda: [fix_grammar_issues.check_phrase_rules(s) for s in stems])
+    suite.run(f"validate/check_grammar_quiz.check_semantic_issues@x{scale}", len(quizzes),
+              lambda: [check_grammar_quiz.check_semantic_issues(q) for q in quizzes])
+    suite.run(f"validate/smart_content_validation.vocab_columns@x{scale}", len(vocab),
+              lambda: smart_content_validation.check_vocab_columns(vocab))
+    suite.run(f"validate/smart_content_validation.vocab_item@x{scale}", len(vocab),
+              lambda: [smart_content_validation.check_vocab_item(item) for item in vocab])
+    suite.run(f"validate/validate_app_content.quiz_item@x{scale}", len(quizzes),
+              lambda: [validate_app_content.check_quiz_item(q) for q in quizzes])
+    suite.run(f"validate/validate_app_content.vocab_item@x{scale}", len(vocab),
+              lambda: [validate_app_content.check_vocab_item(item) for item in vocab])
+
+
+def bench_fixers(suite, scale, quizzes, quiz_files, work_dir):
+    stems = [q.get('stem', '') for q in quizzes]
+    suite.run(f"fix/fix_grammar_issues.fix_stem@x{scale}", len(stems),
+              lambda: [fix_grammar_issues.fix_stem(s) for s in stems])
+
+    # The file fixers rewrite their files, so they run on fresh copies each time
+    copy_dir = Path(work_dir) / f"fix_x{scale}"
+    copies = [copy_dir / path.name for path in quiz_files]
+
+    def copy_files():
+        copy_dir.mkdir(exist_ok=True)
+        for src, dest in zip(quiz_files, copies):
+            shutil.copyfile(src, dest)
+
+    suite.run(f"fix/fix_grammar_issues.process_quiz_file@x{scale}", len(quizzes),
+              lambda: [fix_grammar_issues.process_quiz_file(path) for path in copies], setup=copy_files)
+    suite.run(f"fix/fix_remaining_issues.fix_quiz_file@x{scale}", len(quizzes),
+              lambda: [fix_remaining_issues.fix_quiz_file(path) for path in copies], setup=copy_files)
+
+
+# ===== BASELINE =====
+
+def environment():
+    return {'python': platform.python_version(), 'machine': platform.machine(), 'system': platform.system(),
+            'json': json_codec.BACKEND}
+
+
+def compare(results, baseline, threshold):
+    """Print the change per stage and return the stages that regressed"""
+    regressions = []
+    print(f"\n{'Stage':<60} {'baseline':>10} {'now':>10} {'change':>8}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<60} {'-':>10} {result['seconds']:>10.4f} {'new':>8}")
+            continue
+        # Compare per-item time so a changed dataset size is not a regression
+        before = base['seconds'] / max(base['items'], 1)
+        now = result['seconds'] / max(result['items'], 1)
+        change = now / before - 1 if before else 0
+        slower = result['seconds'] - base['seconds'] * result['items'] / max(base['items'], 1)
+        regressed = change > threshold and slower > MIN_DELTA_SECONDS
+        flag = ' ❌' if regressed else ''
+        print(f"{name:<60} {base['seconds']:>10.4f} {result['seconds']:>10.4f} {change:>+8.0%}{flag}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the content toolchain against a baseline")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1],
+                        help='dataset sizes to run, 1 = real assets (default: 1)')
+    parser.add_argument('--stages', nargs='+',
+                        help='only run stages whose names start with these prefixes')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs per stage; the fastest counts (default: 3)')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH,
+                        help='baseline file (default: scripts/benchmark_baseline.json)')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='store these results as the baseline instead of comparing')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='fail when a stage is this much slower per item (default: 0.25)')
+    args = parser.parse_args()
+
+    print("="*100)
+    print("CONTENT TOOLCHAIN BENCHMARK")
+    print("="*100)
+
+    suite = Suite(args.repeat, args.stages)
+    with tempfile.TemporaryDirectory(prefix='engpocket_bench_') as work_dir:
+        for scale in args.scales:
+            print(f"\nDataset x{scale}")
+            quiz_files, vocab_files = make_dataset(scale, work_dir)
+            quizzes, vocab = load_records(quiz_files, vocab_files)
+            bench_generation(suite, scale)
+            bench_json(suite, scale, quiz_files, vocab_files)
+            bench_validators(suite, scale, quizzes, vocab)
+            bench_fixers(suite, scale, quizzes, quiz_files, work_dir)
+
+    baseline = {'environment': environment(), 'stages': {}}
+    if args.baseline.exists():
+        baseline = json_codec.load(args.baseline)
+
+    if args.save_baseline:
+        baseline['environment'] = environment()
+        baseline['stages'].update(suite.results)
+        json_codec.dump_pretty(baseline, args.baseline)
+        print(f"\n📄 Baseline saved to: {args.baseline.name} ({len(suite.results)} stages)")
+        return
+
+    if not baseline['stages']:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline first")
+        return
+    if baseline.get('environment') != environment():
+        print(f"\n⚠️  Baseline was recorded on {baseline.get('environment')}, this is {environment()}")
+
+    regressions = compare(suite.results, baseline['stages'], args.threshold)
+    if regressions:
+        raise SystemExit(f"\n❌ {len(regressions)} stage(s) regressed more than {args.threshold:.0%}: "
+                         + ", ".join(regressions))
+    print(f"\n✅ No stage regressed more than {args.threshold:.0%}")
+
+
+if __name__ == '__main__':
+    main()
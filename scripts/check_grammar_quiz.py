@@ -2,44 +2,61 @@
 Grammar Quiz Validator
 ตรวจสอบข้อสอบ grammar ว่ามีข้อไหนไม่ถูกต้องบ้าง
 """
-import json
 import os
 from pathlib import Path
 
+import json_codec
+from quiz_stream import iter_quiz_files
+from stem_rules import RuleSet
+
 # Path to quiz files
 QUIZ_DIR = Path(__file__).parent.parent / "assets" / "data" / "quiz"
 
+# Weird semantic combinations, checked against the lowercased filled-in sentence
+SEMANTIC_RULES = RuleSet()
+
+# Check "closes my eyes" issues - one person closing someone else's body parts
+SEMANTIC_RULES.regex(
+    "closing_others_body_parts",
+    r"(he|she|my father|my mother|the teacher|john|mary|tom|lisa|david|sarah|the man|the woman|the boy|the girl).*closes?\s+my\s+(eyes|ears|mouth|nose)",
+    "Semantic: Person closing someone else's body parts")
+
+# More rules can be registered here
+SEMANTIC_RULES.compile()
+
+def iter_all_quizzes():
+    """Stream every question of every grammar quiz file, tagged with its file and difficulty"""
+    files = sorted(QUIZ_DIR.glob("grammar_quiz_*.json"))
+    for file_name, difficulty, q in iter_quiz_files(files):
+        q["_file"] = file_name
+        q["_difficulty"] = difficulty
+        yield q
+
 def load_all_quizzes():
     """Load all grammar quiz files"""
-    quizzes = []
-    for file in sorted(QUIZ_DIR.glob("grammar_quiz_*.json")):
-        with open(file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            file_name = file.name
-            for difficulty in ["easy", "medium", "hard"]:
-                if difficulty in data:
-                    for q in data[difficulty]:
-                        q["_file"] = file_name
-                        q["_difficulty"] = difficulty
-                        quizzes.append(q)
-    return quizzes
-
-def count_quizzes():
-    """Count quizzes per file and total"""
+    return list(iter_all_quizzes())
+
+def print_quiz_counts(counts):
+    """Print per-file question counts and return the total"""
     total = 0
     print("\n=== Quiz Count Per File ===")
-    for file in sorted(QUIZ_DIR.glob("grammar_quiz_*.json")):
-        with open(file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        count = 0
-        for difficulty in ["easy", "medium", "hard"]:
-            if difficulty in data:
-                count += len(data[difficulty])
-        print(f"{file.name}: {count:,} questions")
+    for file_name, count in counts.items():
+        print(f"{file_name}: {count:,} questions")
         total += count
     print(f"\n=== Total: {total:,} questions ===\n")
     return total
 
+def count_quizzes(quizzes=None):
+    """Count quizzes per file and total"""
+    if quizzes is None:
+        quizzes = iter_all_quizzes()
+    
+    counts = {}
+    for q in quizzes:
+        counts[q["_file"]] = counts.get(q["_file"], 0) + 1
+    
+    return print_quiz_counts(counts)
+
 def check_basic_structure(question):
     """Check if question has all required fields"""
     required_fields = ["stem", "choices", "correctIndex", "explanation", "id"]
@@ -111,21 +128,10 @@ def check_semantic_issues(question):
     correct_answer = choices[correct_idx]
     full_sentence = stem.replace("_____", correct_answer).replace("____", correct_answer)
     
-    # Check for weird semantic combinations
-    semantic_checks = [
-        # Check "closes my eyes" issues - one person closing someone else's body parts
-        (r"(he|she|my father|my mother|the teacher|john|mary|tom|lisa|david|sarah|the man|the woman|the boy|the girl).*closes?\s+my\s+(eyes|ears|mouth|nose)", 
-         "Semantic: Person closing someone else's body parts"),
-        
-        # More pattern checks can be added here
-    ]
-    
-    import re
     full_lower = full_sentence.lower()
     
-    for pattern, message in semantic_checks:
-        if re.search(pattern, full_lower):
-            issues.append(message)
+    for hit in SEMANTIC_RULES.fired(full_lower):
+        issues.append(hit.rule.message)
     
     return issues
 
@@ -147,35 +153,43 @@ def check_duplicate_phrases(quizzes):
     
     return duplicates
 
-def validate_all_quizzes():
+def validate_question(q):
+    """Issue entry for one question, or None if it is clean"""
+    issues = []
+    
+    # Basic structure check
+    issues.extend(check_basic_structure(q))
+    
+    # Grammar issues
+    issues.extend(check_grammar_issues(q))
+    
+    # Semantic issues
+    issues.extend(check_semantic_issues(q))
+    
+    if not issues:
+        return None
+    return {
+        "id": q.get("id", "unknown"),
+        "file": q.get("_file", "unknown"),
+        "difficulty": q.get("_difficulty", "unknown"),
+        "stem": q.get("stem", ""),
+        "correct_answer": q.get("choices", [])[q.get("correctIndex", 0)] if q.get("choices") else "",
+        "issues": issues
+    }
+
+def validate_all_quizzes(quizzes=None):
     """Main validation function"""
-    quizzes = load_all_quizzes()
+    if quizzes is None:
+        quizzes = load_all_quizzes()
     
     print(f"Loaded {len(quizzes):,} questions")
     
     all_issues = []
     
     for q in quizzes:
-        issues = []
-        
-        # Basic structure check
-        issues.extend(check_basic_structure(q))
-        
-        # Grammar issues
-        issues.extend(check_grammar_issues(q))
-        
-        # Semantic issues
-        issues.extend(check_semantic_issues(q))
-        
-        if issues:
-            all_issues.append({
-                "id": q.get("id", "unknown"),
-                "file": q.get("_file", "unknown"),
-                "difficulty": q.get("_difficulty", "unknown"),
-                "stem": q.get("stem", ""),
-                "correct_answer": q.get("choices", [])[q.get("correctIndex", 0)] if q.get("choices") else "",
-                "issues": issues
-            })
+        entry = validate_question(q)
+        if entry:
+            all_issues.append(entry)
     
     return all_issues
 
@@ -185,12 +199,24 @@ def generate_report():
     print("Grammar Quiz Validation Report")
     print("=" * 60)
     
+    # One streaming pass feeds the count, the checks and the duplicate scan,
+    # so no more than one question is held as a full dict at a time
+    counts = {}
+    issues = []
+    stems = []
+    for q in iter_all_quizzes():
+        counts[q["_file"]] = counts.get(q["_file"], 0) + 1
+        entry = validate_question(q)
+        if entry:
+            issues.append(entry)
+        stems.append({"stem": q.get("stem", ""), "id": q.get("id", "unknown")})
+    
     # Count quizzes
-    total = count_quizzes()
+    total = print_quiz_counts(counts)
     
     # Validate
     print("Validating questions...")
-    issues = validate_all_quizzes()
+    print(f"Loaded {total:,} questions")
     
     if issues:
         print(f"\n=== Found {len(issues)} questions with issues ===\n")
@@ -219,8 +245,7 @@ def generate_report():
         
         # Save full report
         report_path = Path(__file__).parent / "grammar_issues_report.json"
-        with open(report_path, "w", encoding="utf-8") as f:
-            json.dump(issues, f, ensure_ascii=False, indent=2)
+        json_codec.dump_pretty(issues, report_path)
         print(f"\n\nFull report saved to: {report_path}")
     else:
         print("\n✅ No issues found!")
@@ -230,8 +255,7 @@ def generate_report():
     print("Checking for duplicates...")
     print("=" * 60)
     
-    quizzes = load_all_quizzes()
-    duplicates = check_duplicate_phrases(quizzes)
+    duplicates = check_duplicate_phrases(stems)
     
     if duplicates:
         print(f"\nFound {len(duplicates)} duplicate stems:")
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQLite content database builder
+Ingests every asset the validation engine knows about (vocab, grammar quiz
+banks, exam packs, reading passages, grammar topics) into one prebuilt
+SQLite file with indexed tables and FTS5 search, and runs the structural
+validators as SQL queries against it.
+
+Usage:
+    python content_db.py                    build scripts/build/content.db
+    python content_db.py --check            build, then run the SQL checks
+    python content_db.py --db FILE --check  check an existing database
+"""
+import argparse
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+from content_validation import find_content_files, iter_records
+import json_codec
+
+# Kept out of assets/data: Flutter bundles everything in a listed asset directory
+DB_PATH = Path(__file__).parent / "build" / "content.db"
+REPORT_PATH = Path(__file__).parent / "content_db_report.json"
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE vocab (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT,
+    word TEXT,
+    translation TEXT,
+    pos TEXT,
+    example TEXT,
+    level TEXT,
+    pack_id TEXT,
+    file TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE questions (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT,
+    kind TEXT NOT NULL,
+    pack_id TEXT,
+    difficulty TEXT,
+    parent TEXT,
+    stem TEXT,
+    choices TEXT,
+    correct_index INTEGER,
+    explanation TEXT,
+    skill_type TEXT,
+    file TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE passages (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT,
+    title TEXT,
+    content TEXT,
+    difficulty TEXT,
+    topic TEXT,
+    word_count INTEGER,
+    file TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE grammar_topics (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT,
+    title TEXT,
+    explanation TEXT,
+    file TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE exam_packs (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT,
+    name TEXT,
+    exam_type TEXT,
+    difficulty TEXT,
+    num_questions INTEGER,
+    file TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+
+CREATE INDEX vocab_id ON vocab(id);
+CREATE INDEX vocab_level ON vocab(level);
+CREATE INDEX vocab_word ON vocab(word COLLATE NOCASE);
+CREATE INDEX questions_id ON questions(id);
+CREATE INDEX questions_pack ON questions(pack_id, difficulty);
+CREATE INDEX questions_kind ON questions(kind, difficulty);
+CREATE INDEX passages_id ON passages(id);
+CREATE INDEX passages_difficulty ON passages(difficulty);
+CREATE INDEX grammar_topics_id ON grammar_topics(id);
+CREATE INDEX exam_packs_id ON exam_packs(id);
+
+CREATE VIRTUAL TABLE vocab_fts USING fts5(word, example, content='vocab', content_rowid='rowid');
+CREATE VIRTUAL TABLE questions_fts USING fts5(stem, choices, content='questions', content_rowid='rowid');
+CREATE VIRTUAL TABLE passages_fts USING fts5(title, content, content='passages', content_rowid='rowid');
+"""
+
+FTS_TABLES = ["vocab_fts", "questions_fts", "passages_fts"]
+
+# Record kind from content_validation.iter_records -> questions.kind
+QUESTION_KINDS = {
+    'quiz_question': 'quiz',
+    'exam_question': 'exam',
+    'reading_question': 'reading',
+}
+
+
+def _json(value):
+    return json.dumps(value, ensure_ascii=False)
+
+
+def insert_record(conn, file_name, kind, record, context):
+    """Insert one record yielded by iter_records into its table"""
+    file_name = context.get('file', file_name)
+    data = _json(record)
+
+    if kind == 'vocab_item':
+        conn.execute(
+            "INSERT INTO vocab (id, word, translation, pos, example, level, pack_id, file, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (record.get('id'), record.get('word'), record.get('translation'),
+             record.get('pos') or record.get('partOfSpeech'),
+             record.get('example') or record.get('exampleEn'),
+             record.get('level'), record.get('packId'), file_name, data))
+
+    elif kind in QUESTION_KINDS:
+        choices = record.get('choices')
+        conn.execute(
+            "INSERT INTO questions (id, kind, pack_id, difficulty, parent, stem, choices, correct_index, "
+            "explanation, skill_type, file, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (record.get('id'), QUESTION_KINDS[kind], record.get('packId') or context.get('pack'),
+             context.get('difficulty'),
+             context.get('passage') or context.get('topic') or context.get('pack'),
+             record.get('stem'), None if choices is None else _json(choices),
+             record.get('correctIndex'), record.get('explanation'), record.get('skillType'),
+             file_name, data))
+
+    elif kind == 'passage':
+        passage = {k: v for k, v in record.items() if k != 'questions'}
+        conn.execute(
+            "INSERT INTO passages (id, title, content, difficulty, topic, word_count, file, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (record.get('id'), record.get('title'), record.get('content'), record.get('difficulty'),
+             record.get('topic'), record.get('wordCount'), file_name, _json(passage)))
+
+    elif kind == 'grammar_topic':
+        topic = {k: v for k, v in record.items() if k != 'quizQuestions'}
+        conn.execute(
+            "INSERT INTO grammar_topics (id, title, explanation, file, data) VALUES (?, ?, ?, ?, ?)",
+            (record.get('id'), record.get('title'), record.get('explanation'), file_name, _json(topic)))
+
+
+def insert_exam_packs(conn, file_name, data):
+    """Exam pack metadata, which iter_records does not yield"""
+    for pack in data.get('packs', []) + data.get('examPacks', []):
+        meta = {k: v for k, v in pack.items() if k != 'questions'}
+        conn.execute(
+            "INSERT INTO exam_packs (id, name, exam_type, difficulty, num_questions, file, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (pack.get('id'), pack.get('name'), pack.get('examType'), pack.get('difficulty'),
+             pack.get('numQuestions'), file_name, _json(meta)))
+
+
+def build_database(files, out_path=DB_PATH):
+    """Build a fresh content database from asset files, return row counts per table"""
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        with conn:
+            for path in files:
+                path = Path(path)
+                data = json_codec.load(path)
+                for kind, record, context in iter_records(path.name, data):
+                    insert_record(conn, path.name, kind, record, context)
+                if path.name.startswith('exam_pack'):
+                    insert_exam_packs(conn, path.name, data)
+            for fts in FTS_TABLES:
+                conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+        conn.execute("VACUUM")
+        counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                  for table in ['vocab', 'questions', 'passages', 'grammar_topics', 'exam_packs']}
+    finally:
+        conn.close()
+
+    # Replace the previous build only once the new one is complete
+    os.replace(tmp_path, out_path)
+    return counts
+
+
+# ===== SQL CHECKS =====
+# name -> (category, severity, query); each query returns (file, id, message)
+
+SQL_CHECKS = {
+    'missing_fields': ('structure', 'high', """
+        SELECT file, id, 'Missing field: ' || (CASE
+            WHEN stem IS NULL THEN 'stem'
+            WHEN choices IS NULL THEN 'choices'
+            WHEN correct_index IS NULL THEN 'correctIndex'
+            WHEN explanation IS NULL THEN 'explanation'
+            ELSE 'id' END)
+        FROM questions
+        WHERE kind IN ('quiz', 'exam')
+          AND (stem IS NULL OR choices IS NULL OR correct_index IS NULL
+               OR explanation IS NULL OR id IS NULL)
+    """),
+    'choice_count': ('structure', 'high', """
+        SELECT file, id, 'Expected 4 choices, got ' || json_array_length(choices)
+        FROM questions
+        WHERE kind IN ('quiz', 'exam') AND json_array_length(choices) != 4
+    """),
+    'correct_index_range': ('structure', 'high', """
+        SELECT file, id, 'Invalid correctIndex: ' || correct_index
+        FROM questions
+        WHERE correct_index < 0 OR correct_index >= json_array_length(choices)
+    """),
+    'duplicate_choices': ('structure', 'medium', """
+        SELECT file, id, 'Duplicate choices'
+        FROM questions
+        WHERE EXISTS (SELECT 1 FROM json_each(questions.choices) GROUP BY value HAVING COUNT(*) > 1)
+    """),
+    'missing_blank': ('grammar', 'medium', """
+        SELECT file, id, 'Stem missing blank placeholder (_____)'
+        FROM questions
+        WHERE kind = 'quiz' AND instr(stem, '____') = 0
+    """),
+    'duplicate_stem': ('duplicates', 'low', """
+        SELECT file, id, 'Duplicate of ' || first_id || ' in ' || first_file
+        FROM (SELECT file, id,
+                     first_value(id) OVER same_stem AS first_id,
+                     first_value(file) OVER same_stem AS first_file,
+                     row_number() OVER same_stem AS n
+              FROM questions WHERE kind = 'quiz'
+              WINDOW same_stem AS (PARTITION BY stem ORDER BY rowid))
+        WHERE n > 1
+    """),
+    'duplicate_vocab_id': ('duplicates', 'high', """
+        SELECT file, id, 'Duplicate of ' || first_id || ' in ' || first_file
+        FROM (SELECT file, id,
+                     first_value(id) OVER same_id AS first_id,
+                     first_value(file) OVER same_id AS first_file,
+                     row_number() OVER same_id AS n
+              FROM vocab
+              WINDOW same_id AS (PARTITION BY id ORDER BY rowid))
+        WHERE n > 1
+    """),
+    'missing_translation': ('thai', 'high', """
+        SELECT file, id, 'Missing translation'
+        FROM vocab
+        WHERE translation IS NULL OR trim(translation) = ''
+    """),
+}
+
+
+def run_sql_checks(conn, checks=SQL_CHECKS):
+    """Run SQL checks, return issues in the content_validation record layout"""
+    issues = []
+    for name, (category, severity, query) in checks.items():
+        for file_name, record_id, message in conn.execute(query):
+            issues.append({
+                'file': file_name,
+                'id': record_id if record_id is not None else 'unknown',
+                'category': category,
+                'check': name,
+                'severity': severity,
+                'message': message,
+            })
+    return issues
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the SQLite content database and run SQL checks")
+    parser.add_argument('--db', type=Path,
+                        help='check this existing database instead of building one')
+    parser.add_argument('--out', type=Path, default=DB_PATH,
+                        help='database file to build (default: scripts/build/content.db)')
+    parser.add_argument('--report', type=Path, default=REPORT_PATH,
+                        help='where to write the SQL check report (default: scripts/content_db_report.json)')
+    parser.add_argument('--check', action='store_true',
+                        help='run the SQL checks and write a report')
+    args = parser.parse_args()
+
+    print("="*80)
+    print("CONTENT DATABASE")
+    print("="*80)
+
+    db_path = args.db
+    if db_path is None:
+        files = find_content_files()
+        counts = build_database(files, args.out)
+        db_path = args.out
+        print(f"Built {db_path} from {len(files)} files ({db_path.stat().st_size:,} bytes)")
+        for table, count in counts.items():
+            print(f"  {table}: {count:,} rows")
+
+    if not args.check:
+        return
+
+    conn = sqlite3.connect(db_path)
+    try:
+        issues = run_sql_checks(conn)
+    finally:
+        conn.close()
+
+    print(f"\nSQL checks: {len(issues)} issues")
+    for name in SQL_CHECKS:
+        count = sum(1 for issue in issues if issue['check'] == name)
+        print(f"  {'✅' if not count else '⚠️ '} {name}: {count}")
+
+    json_codec.dump_pretty({'database': str(db_path), 'total_issues': len(issues), 'issues': issues},
+                           args.report)
+    print(f"\n📄 Report saved to: {args.report}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Unified content validation engine
+Loads every asset under assets/data once and runs all registered checks over
+it in a single pass: structure, grammar, semantics, Thai and duplicates.
+"""
+import argparse
+import time
+from collections import ChainMap, defaultdict
+from pathlib import Path
+
+import check_grammar_quiz
+import fix_grammar_issues
+import json_codec
+import smart_content_validation
+from file_pool import add_jobs_argument, map_files
+from file_watch import watch
+from validation_cache import record_hash
+from vocab_store import FORMAT as VOCAB_STORE_FORMAT, STORE_NAME, iter_store_files, load_store
+
+DATA_DIR = Path(__file__).parent.parent / "assets" / "data"
+REPORT_PATH = Path(__file__).parent / "content_validation_report.json"
+
+DIFFICULTIES = ['easy', 'medium', 'hard']
+
+# record kind -> [(category, check name, severity, func)]
+CHECKS = defaultdict(list)
+
+# record kind -> [(category, index name, key func)]; records sharing a key are duplicates
+INDEXES = defaultdict(list)
+
+
+def register(kind, category, severity='medium'):
+    """Register a per-record check for a record kind
+
+    The check gets the record and returns a list of issues, each either a
+    message string or a dict with 'message'/'description' and optionally
+    'type', 'severity' and 'field'.
+    """
+    def decorator(func):
+        CHECKS[kind].append((category, func.__name__, severity, func))
+        return func
+    return decorator
+
+
+def register_index(kind, category):
+    """Register a key function whose collisions across all files are reported"""
+    def decorator(func):
+        INDEXES[kind].append((category, func.__name__, func))
+        return func
+    return decorator
+
+
+# ===== ASSET DISCOVERY =====
+
+def find_content_files(data_dir=DATA_DIR, vocab_store=None):
+    """All asset files the engine knows how to read
+
+    With a vocab store, the source files it was built from are replaced by
+    the store itself.
+    """
+    data_dir = Path(data_dir)
+    vocab_files = [p for p in sorted(data_dir.glob('vocab_*.json')) if p.name != STORE_NAME]
+    if vocab_store:
+        merged = set(load_store(vocab_store)['files'])
+        vocab_files = [p for p in vocab_files if p.name not in merged] + [Path(vocab_store)]
+    return (
+        vocab_files
+        + sorted(data_dir.glob('exam_pack*.json'))
+        + [p for p in [data_dir / 'reading_passages.json', data_dir / 'grammar_topics.json'] if p.exists()]
+        + sorted(data_dir.glob('quiz/grammar_quiz_*.json'))
+    )
+
+
+def iter_records(file_name, data):
+    """Yield (kind, record, context) for every checkable record in a loaded asset
+
+    A 'file' key in the context overrides the file name reported for issues.
+    """
+    if file_name.startswith('grammar_quiz_'):
+        for difficulty in DIFFICULTIES:
+            for q in data.get(difficulty, []):
+                yield 'quiz_question', q, {'difficulty': difficulty}
+
+    elif isinstance(data, dict) and data.get('format') == VOCAB_STORE_FORMAT:
+        for source, items in iter_store_files(data):
+            for item in items:
+                yield 'vocab_item', item, {'file': source}
+
+    elif file_name.startswith('vocab_'):
+        for item in data if isinstance(data, list) else []:
+            if isinstance(item, dict):
+                yield 'vocab_item', item, {}
+
+    elif file_name == 'reading_passages.json':
+        for passage in data:
+            yield 'passage', passage, {}
+            for q in passage.get('questions', []):
+                yield 'reading_question', q, {'passage': passage.get('id')}
+
+    elif file_name == 'grammar_topics.json':
+        for topic in data:
+            yield 'grammar_topic', topic, {}
+            for q in topic.get('quizQuestions', []):
+                yield 'exam_question', q, {'topic': topic.get('id')}
+
+    elif file_name.startswith('exam_pack'):
+        for q in data.get('questions', []):
+            yield 'exam_question', q, {}
+        for pack in data.get('examPacks', []):
+            for q in pack.get('questions', []):
+                yield 'exam_question', q, {'pack': pack.get('id')}
+
+
+# ===== REGISTERED CHECKS =====
+
+@register('quiz_question', 'structure', severity='high')
+def quiz_structure(q):
+    return check_grammar_quiz.check_basic_structure(q)
+
+
+@register('quiz_question', 'grammar')
+def quiz_grammar(q):
+    return check_grammar_quiz.check_grammar_issues(q)
+
+
+@register('quiz_question', 'grammar', severity='low')
+def quiz_capitalization(q):
+    return fix_grammar_issues.check_capitalization_issues(q.get('stem', ''))
+
+
+@register('quiz_question', 'semantics')
+def quiz_semantics(q):
+    return check_grammar_quiz.check_semantic_issues(q)
+
+
+@register('quiz_question', 'semantics')
+def quiz_phrase_rules(q):
+    return fix_grammar_issues.check_phrase_rules(q.get('stem', ''))
+
+
+@register('exam_question', 'structure', severity='high')
+def exam_structure(q):
+    return check_grammar_quiz.check_basic_structure(q)
+
+
+@register('vocab_item', 'thai')
+def vocab_translation(item):
+    return [dict(issue, field='translation')
+            for issue in smart_content_validation.check_thai_translation(item.get('translation', ''))]
+
+
+@register('vocab_item', 'grammar')
+def vocab_example(item):
+    example = item.get('example') or item.get('exampleEn') or ''
+    if len(example) <= 10:
+        return []
+    return [dict(issue, field='example')
+            for issue in smart_content_validation.check_english_grammar(example, 'sentence')]
+
+
+@register('passage', 'grammar')
+def passage_content(passage):
+    return [dict(issue, field='content')
+            for issue in smart_content_validation.check_english_grammar(passage.get('content', ''), 'passage')]
+
+
+@register('reading_question', 'grammar')
+def reading_question_stem(q):
+    return [dict(issue, field='question_stem')
+            for issue in smart_content_validation.check_english_grammar(q.get('stem', ''), 'question')]
+
+
+@register_index('quiz_question', 'duplicates')
+def duplicate_stem(q):
+    return q.get('stem')
+
+
+# ===== ENGINE =====
+
+def normalize_issue(raw, category, check, severity):
+    """Turn the various issue shapes returned by checks into one record layout"""
+    if isinstance(raw, str):
+        return {'category': category, 'check': check, 'severity': severity, 'message': raw}
+    issue = {
+        'category': category,
+        'check': check,
+        'severity': raw.get('severity', severity),
+        'message': raw.get('message') or raw.get('description') or raw.get('type', ''),
+    }
+    for key in ('type', 'field', 'rule'):
+        if key in raw:
+            issue[key] = raw[key]
+    return issue
+
+
+def check_record(kind, record):
+    """Run every check registered for a record kind, return normalized issues"""
+    issues = []
+    for category, check, severity, func in CHECKS[kind]:
+        for raw in func(record):
+            issues.append(normalize_issue(raw, category, check, severity))
+    return issues
+
+
+def validate_data(file_name, data, memo=None):
+    """Single pass over one loaded asset
+
+    Returns (issues, keys) where keys maps index name to a list of
+    (key, record id) pairs to be merged across files. With a memo dict,
+    records already checked (by content hash) are not checked again, and
+    every key the file used ends up in the memo.
+    """
+    issues = []
+    keys = defaultdict(list)
+
+    for kind, record, context in iter_records(file_name, data):
+        record_id = record.get('id', 'unknown')
+        if memo is None:
+            record_issues = check_record(kind, record)
+        else:
+            memo_key = (kind, record_hash(record))
+            record_issues = memo.get(memo_key)
+            if record_issues is None:
+                record_issues = check_record(kind, record)
+            memo[memo_key] = record_issues
+        for issue in record_issues:
+            issues.append({'file': file_name, 'id': record_id, 'kind': kind, **context, **issue})
+
+        for category, name, key_func in INDEXES[kind]:
+            key = key_func(record)
+            if key is not None:
+                keys[(category, name)].append((key, record_id))
+
+    return issues, keys
+
+
+def validate_file(path, memo=None):
+    """Load one asset file and validate it"""
+    path = Path(path)
+    data = json_codec.load(path)
+    return validate_data(path.name, data, memo)
+
+
+def find_duplicates(per_file_keys):
+    """Merge (file, keys) results and report every key seen more than once"""
+    first_seen = {}
+    issues = []
+    for file_name, keys in per_file_keys:
+        for (category, name), entries in keys.items():
+            for key, record_id in entries:
+                first = first_seen.setdefault((name, key), (file_name, record_id))
+                if first != (file_name, record_id):
+                    issues.append({
+                        'file': file_name,
+                        'id': record_id,
+                        'category': category,
+                        'check': name,
+                        'severity': 'low',
+                        'message': f'Duplicate of {first[1]} in {first[0]}',
+                        'value': key,
+                    })
+    return issues
+
+
+def summarize(issues, files_checked):
+    """Counts by category, check and severity"""
+    by_category = defaultdict(int)
+    by_check = defaultdict(int)
+    by_severity = defaultdict(int)
+    for issue in issues:
+        by_category[issue['category']] += 1
+        by_check[issue['check']] += 1
+        by_severity[issue['severity']] += 1
+    return {
+        'files_checked': files_checked,
+        'total_issues': len(issues),
+        'status': 'PASSED' if not issues else 'NEEDS_REVIEW',
+        'by_category': dict(by_category),
+        'by_check': dict(by_check),
+        'by_severity': dict(by_severity),
+    }
+
+
+def validate_all(files, jobs=1):
+    """Validate every file once and return the combined report"""
+    issues = []
+    per_file_keys = []
+
+    for path, (file_issues, keys) in zip(files, map_files(validate_file, files, jobs)):
+        issues.extend(file_issues)
+        per_file_keys.append((Path(path).name, keys))
+        print(f"  {Path(path).name}: {len(file_issues)} issues")
+
+    issues.extend(find_duplicates(per_file_keys))
+
+    return {'summary': summarize(issues, len(files)), 'issues': issues}
+
+
+def issue_key(issue):
+    return json_codec.dumps_compact(issue, sort_keys=True)
+
+
+def print_issue_diff(old_issues, new_issues):
+    """Print issues that appeared (+) and were resolved (-); return the counts"""
+    old = {issue_key(i): i for i in old_issues}
+    new = {issue_key(i): i for i in new_issues}
+    added = [new[k] for k in new if k not in old]
+    resolved = [old[k] for k in old if k not in new]
+    for sign, issues in (('+', added), ('-', resolved)):
+        for issue in issues:
+            print(f"  {sign} {issue['file']} {issue['id']} [{issue['check']}] {issue['message']}")
+    return len(added), len(resolved)
+
+
+def watch_content(files_func, jobs=1, interval=1.0):
+    """Validate everything once, then re-validate only the files that change
+
+    Unchanged records inside a changed file come from an in-memory memo, and
+    each round prints the issues that appeared or were resolved.
+    """
+    files = files_func()
+    state = dict(zip(files, map_files(validate_file, files, jobs)))
+    # Record results per file, so the memo only ever holds live records
+    memos = {}
+
+    def duplicates():
+        return find_duplicates((path.name, keys) for path, (_, keys) in state.items())
+
+    current_duplicates = duplicates()
+    total = sum(len(issues) for issues, _ in state.values()) + len(current_duplicates)
+    print(f"Initial pass: {len(files)} files, {total} issues")
+
+    directories = sorted({path.parent for path in files})
+    for changed in watch(directories, files_func, interval):
+        print(f"\n🔄 {time.strftime('%H:%M:%S')} changed: {', '.join(sorted(p.name for p in changed))}")
+        old_issues, new_issues = [], []
+        shared = {}
+        for memo in memos.values():
+            shared.update(memo)
+        for path in sorted(changed):
+            if not path.exists():
+                if path in state:
+                    old_issues.extend(state.pop(path)[0])
+                memos.pop(path, None)
+                continue
+            memo = {}
+            try:
+                result = validate_file(path, ChainMap(memo, shared))
+            except ValueError as e:
+                # Probably mid-save: keep the last good result until it parses
+                print(f"  ⚠️  {path.name}: not valid JSON yet ({e})")
+                continue
+            if path in state:
+                old_issues.extend(state[path][0])
+            state[path] = result
+            memos[path] = memo
+            new_issues.extend(result[0])
+
+        previous_duplicates, current_duplicates = current_duplicates, duplicates()
+        added, resolved = print_issue_diff(old_issues + previous_duplicates, new_issues + current_duplicates)
+        total = sum(len(issues) for issues, _ in state.values()) + len(current_duplicates)
+        print(f"  {added} new, {resolved} resolved, {total} issues in total")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate all app content in a single pass")
+    add_jobs_argument(parser)
+    parser.add_argument('--vocab-store', type=Path,
+                        help='read vocab from a consolidated store built by vocab_store.py')
+    parser.add_argument('--watch', action='store_true',
+                        help='keep running and re-validate files as they change')
+    parser.add_argument('--interval', type=float, default=1.0,
+                        help='polling interval in seconds when inotify is unavailable (default: 1)')
+    args = parser.parse_args()
+
+    if args.watch:
+        try:
+            watch_content(lambda: find_content_files(vocab_store=args.vocab_store), args.jobs, args.interval)
+        except KeyboardInterrupt:
+            print("\nStopped watching")
+        return
+
+    print("="*100)
+    print("UNIFIED CONTENT VALIDATION")
+    print("Structure, Grammar, Semantics, Thai and Duplicates in one pass")
+    print("="*100)
+
+    files = find_content_files(vocab_store=args.vocab_store)
+    report = validate_all(files, args.jobs)
+    summary = report['summary']
+
+    print(f"\n{'='*100}")
+    print("SUMMARY")
+    print(f"{'='*100}")
+    print(f"Files checked: {summary['files_checked']}")
+    print(f"Issues found: {summary['total_issues']}")
+    for category, count in sorted(summary['by_category'].items(), key=lambda x: -x[1]):
+        print(f"  {category}: {count}")
+
+    json_codec.dump_pretty(report, REPORT_PATH)
+
+    print(f"\n📄 Detailed report saved to: {REPORT_PATH.name}")
+
+
+if __name__ == '__main__':
+    main()
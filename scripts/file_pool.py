@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Process pool helper shared by the validators
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+
+def map_files(func, files, jobs=1):
+    """Apply func to every file, in a process pool when jobs > 1
+
+    func must be a module-level function so it can be pickled. Results come
+    back in the same order as files regardless of which worker finished
+    first, so merged reports stay stable.
+    """
+    files = list(files)
+    if jobs <= 1 or len(files) <= 1:
+        return [func(f) for f in files]
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(files))) as executor:
+        return list(executor.map(func, files))
+
+
+def imap_files(func, files, jobs=1):
+    """Like map_files, but yield results one at a time in files order
+
+    With jobs <= 1 each file is only processed when its result is requested,
+    so callers that consume results as they go never hold them all at once.
+    """
+    files = list(files)
+    if jobs <= 1 or len(files) <= 1:
+        for f in files:
+            yield func(f)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(files))) as executor:
+        yield from executor.map(func, files)
+
+
+def add_jobs_argument(parser):
+    """Add the standard --jobs option to an argparse parser"""
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='validate files in this many worker processes (default: 1)')
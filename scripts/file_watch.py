@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File watching for the validators' --watch mode
+Blocks until files under the watched directories change and reports which
+ones, using inotify on Linux and mtime/size polling everywhere else.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+# inotify event masks (linux/inotify.h)
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_MODIFY
+
+EVENT_HEADER = struct.Struct("iIII")
+
+# Editors save in bursts (write, rename, chmod); wait this long for quiet
+SETTLE_SECONDS = 0.2
+
+
+def snapshot(files):
+    """{path: (mtime_ns, size)} for the files that exist"""
+    result = {}
+    for path in files:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        result[Path(path)] = (stat.st_mtime_ns, stat.st_size)
+    return result
+
+
+def changed_files(before, after):
+    """Paths added, removed or modified between two snapshots"""
+    return {path for path in before.keys() | after.keys() if before.get(path) != after.get(path)}
+
+
+class PollingWatcher:
+    """Wakes up every interval seconds"""
+
+    name = "polling"
+
+    def __init__(self, directories, interval=1.0):
+        self.interval = interval
+
+    def wait(self):
+        time.sleep(self.interval)
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Wakes up when the kernel reports activity in a watched directory"""
+
+    name = "inotify"
+
+    def __init__(self, directories, interval=1.0):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        for directory in directories:
+            if libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK) < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+
+    def _drain(self):
+        # Event contents are not needed: callers diff snapshots to find what changed
+        os.read(self.fd, 64 * (EVENT_HEADER.size + 256))
+
+    def wait(self):
+        select.select([self.fd], [], [])
+        self._drain()
+        while select.select([self.fd], [], [], SETTLE_SECONDS)[0]:
+            self._drain()
+
+    def close(self):
+        os.close(self.fd)
+
+
+def make_watcher(directories, interval=1.0):
+    """inotify where available, polling otherwise"""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directories, interval)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(directories, interval)
+
+
+def watch(directories, list_files, interval=1.0):
+    """Yield the set of changed files each time something under directories changes
+
+    list_files() returns the files currently of interest; it is called again
+    after every wake-up so new files are picked up.
+    """
+    watcher = make_watcher(directories, interval)
+    print(f"👀 Watching {', '.join(str(d) for d in directories)} ({watcher.name}), Ctrl+C to stop")
+    before = snapshot(list_files())
+    try:
+        while True:
+            watcher.wait()
+            after = snapshot(list_files())
+            changed = changed_files(before, after)
+            before = after
+            if changed:
+                yield changed
+    finally:
+        watcher.close()
@@ -3,11 +3,18 @@
 """
 Fix grammar quiz issues and generate validation report
 """
-import json
+import argparse
 import os
 import re
+import sys
 from pathlib import Path
 from collections import defaultdict
+from functools import partial
+
+from file_pool import add_jobs_argument, map_files
+import json_codec
+from quiz_export import export_all
+from stem_rules import RewriteRules, RuleSet
 
 # Define problematic patterns to fix
 PROBLEMATIC_PHRASES = {
@@ -26,6 +33,31 @@ BODY_PART_ISSUES = {
     'close their eyes', 'closes their eyes', 'closed their eyes', 'closing their eyes',
 }
 
+# All literal stem phrases compiled into one matcher
+STEM_RULES = RuleSet()
+for old_phrase, replacement, desc in sorted(PROBLEMATIC_PHRASES):
+    STEM_RULES.phrase(f'redundant:{old_phrase}', old_phrase, desc,
+                      group='redundant', replacement=replacement)
+for phrase in sorted(BODY_PART_ISSUES):
+    STEM_RULES.phrase(f'body_part:{phrase}', phrase,
+                      f'Problematic phrase: "{phrase}" - unclear meaning or awkward phrasing',
+                      group='body_part')
+STEM_RULES.compile()
+
+# Stem rewrites, applied in this order
+STEM_FIXES = RewriteRules()
+for old_phrase, replacement, desc in sorted(PROBLEMATIC_PHRASES):
+    STEM_FIXES.phrase(f'redundant:{old_phrase}', old_phrase, replacement)
+# Lowercase the word after a conjunction: If The -> If the
+STEM_FIXES.regex('capitalization:if_the', r'\b((?i:if)\s+)The\b', r'\1the')
+STEM_FIXES.regex('capitalization:when_you', r'\bWhen\s+You\b', 'When you')
+# When + Capital name (Mary, John, etc) - keep as is (proper nouns)
+STEM_FIXES.regex('capitalization:as_soon_as_the', r'\b((?i:as\s+soon\s+as)\s+)The\b', r'\1the')
+STEM_FIXES.regex('capitalization:did_my', r'\bDid\s+My\b', 'Did my')
+# "does the chef _____ my eyes?" should be "Does the chef _____ my eyes?"
+STEM_FIXES.regex('capitalization:does_the', r'^does\s+the\b', 'Does the')
+STEM_FIXES.compile()
+
 def find_quiz_files():
     """Find all grammar quiz files"""
     quiz_dir = Path('c:/Users/chawa/Downloads/App Test/eng_pocket/assets/data/quiz')
@@ -33,41 +65,44 @@ def find_quiz_files():
 
 def load_quiz_file(filepath):
     """Load quiz JSON file"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return json_codec.load(filepath)
 
 def save_quiz_file(filepath, data):
     """Save quiz JSON file"""
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    json_codec.dump_pretty(data, filepath)
 
-def check_redundant_phrases(stem):
-    """Check for redundant phrases"""
+def check_phrase_rules(stem, group=None):
+    """Check a stem against every phrase rule in a single scan"""
     issues = []
-    stem_lower = stem.lower()
-    for old_phrase, replacement, desc in PROBLEMATIC_PHRASES:
-        if old_phrase in stem_lower:
+    for hit in STEM_RULES.fired(stem):
+        rule = hit.rule
+        if group is not None and rule.meta['group'] != group:
+            continue
+        if rule.meta['group'] == 'redundant':
             issues.append({
                 'type': 'Semantic',
-                'description': desc,
-                'old': old_phrase,
-                'replacement': replacement
+                'description': rule.message,
+                'old': rule.pattern,
+                'replacement': rule.meta['replacement'],
+                'rule': rule.name
             })
-    return issues
-
-def check_body_part_issues(stem):
-    """Check for problematic body part phrases"""
-    issues = []
-    stem_lower = stem.lower()
-    for phrase in BODY_PART_ISSUES:
-        if phrase in stem_lower:
+        else:
             issues.append({
                 'type': 'Semantic',
-                'description': f'Problematic phrase: "{phrase}" - unclear meaning or awkward phrasing',
-                'phrase': phrase
+                'description': rule.message,
+                'phrase': rule.pattern,
+                'rule': rule.name
             })
     return issues
 
+def check_redundant_phrases(stem):
+    """Check for redundant phrases"""
+    return check_phrase_rules(stem, 'redundant')
+
+def check_body_part_issues(stem):
+    """Check for problematic body part phrases"""
+    return check_phrase_rules(stem, 'body_part')
+
 def check_capitalization_issues(stem):
     """Check for improper capitalization"""
     issues = []
@@ -101,139 +136,132 @@ def check_capitalization_issues(stem):
     return issues
 
 def fix_stem(stem):
-    """Fix issues in a stem"""
-    fixed_stem = stem
-    has_changes = False
-    
-    # Fix redundant phrases
-    for old_phrase, replacement, _ in PROBLEMATIC_PHRASES:
-        if old_phrase in fixed_stem.lower():
-            # Case-insensitive replacement
-            pattern = re.compile(re.escape(old_phrase), re.IGNORECASE)
-            fixed_stem = pattern.sub(replacement, fixed_stem)
-            has_changes = True
+    """Fix issues in a stem
     
-    # Fix capitalization after conjunctions
-    # If The -> If the
-    fixed_stem = re.sub(r'\bIf\s+The\b', 'If the', fixed_stem, flags=re.IGNORECASE)
-    if re.search(r'\bIf\s+The\b', fixed_stem):
-        has_changes = True
-    
-    # When You -> When you
-    fixed_stem = re.sub(r'\bWhen\s+You\b', 'When you', fixed_stem)
-    if re.search(r'\bWhen\s+You\b', fixed_stem):
-        has_changes = True
-    
-    # When + Capital name (Mary, John, etc) - keep as is (proper nouns)
-    
-    # As soon as The -> As soon as the
-    fixed_stem = re.sub(r'\bAs\s+soon\s+as\s+The\b', 'As soon as the', fixed_stem, flags=re.IGNORECASE)
-    if re.search(r'\bAs\s+soon\s+as\s+The\b', fixed_stem):
-        has_changes = True
-    
-    # Did My -> Did my
-    fixed_stem = re.sub(r'\bDid\s+My\b', 'Did my', fixed_stem)
-    if re.search(r'\bDid\s+My\b', fixed_stem):
-        has_changes = True
+    Returns (fixed_stem, changes) where changes lists (rule name, count) for
+    every rule that changed the stem, so it is empty when nothing changed.
+    """
+    return STEM_FIXES.apply(stem)
+
+def question_issues(quiz, file_name, difficulty, idx):
+    """Remaining issues in one question, as report entries"""
+    stem = quiz['stem']
+    quiz_id = quiz.get('id', f'unknown_{idx}')
     
-    # Does the -> remove "does" for question with blank
-    # "does the chef _____ my eyes?" should be "Does the chef _____ my eyes?"
-    fixed_stem = re.sub(r'\bdoes\s+the\b', 'Does the', fixed_stem)
-    if re.search(r'\bdoes\s+the\b', fixed_stem):
-        has_changes = True
+    # Check for various issues
+    issues = []
+    issues.extend(check_phrase_rules(stem))
+    issues.extend(check_capitalization_issues(stem))
     
-    return fixed_stem, has_changes
+    return [{
+        'id': quiz_id,
+        'file': file_name,
+        'difficulty': difficulty,
+        'stem': stem,
+        'choices': quiz['choices'],
+        'correctIndex': quiz['correctIndex'],
+        **issue
+    } for issue in issues]
 
-def process_all_quizzes():
-    """Process all quiz files"""
-    quiz_files = find_quiz_files()
+def process_quiz_file(quiz_file, dry_run=False):
+    """Fix one quiz file and validate each question right after fixing it
     
-    total_fixed = 0
-    fixes_by_file = defaultdict(list)
+    The file is parsed once; it is only rewritten when a stem changed, and
+    with dry_run the diff is returned instead of written. Returns
+    (fixes, remaining issues, diff).
+    """
+    quiz_data = load_quiz_file(quiz_file)
+    fixes = []
+    file_issues = []
     
-    for quiz_file in quiz_files:
-        print(f"\nProcessing: {quiz_file.name}")
-        quiz_data = load_quiz_file(quiz_file)
+    # Process each difficulty level
+    for difficulty in ['easy', 'medium', 'hard']:
+        if difficulty not in quiz_data:
+            continue
         
-        # Process each difficulty level
-        for difficulty in ['easy', 'medium', 'hard']:
-            if difficulty not in quiz_data:
-                continue
+        quizzes = quiz_data[difficulty]
+        for idx, quiz in enumerate(quizzes):
+            original_stem = quiz['stem']
+            fixed_stem, changes = fix_stem(original_stem)
             
-            quizzes = quiz_data[difficulty]
-            for idx, quiz in enumerate(quizzes):
-                original_stem = quiz['stem']
-                fixed_stem, has_changes = fix_stem(original_stem)
-                
-                if has_changes:
-                    quiz['stem'] = fixed_stem
-                    total_fixed += 1
-                    fixes_by_file[quiz_file.name].append({
-                        'id': quiz.get('id', f'unknown_{idx}'),
-                        'difficulty': difficulty,
-                        'before': original_stem,
-                        'after': fixed_stem
-                    })
-        
-        # Save the fixed file
-        save_quiz_file(quiz_file, quiz_data)
-        print(f"  ✓ Fixed {len(fixes_by_file[quiz_file.name])} issues")
+            if changes:
+                quiz['stem'] = fixed_stem
+                fixes.append({
+                    'id': quiz.get('id', f'unknown_{idx}'),
+                    'difficulty': difficulty,
+                    'before': original_stem,
+                    'after': fixed_stem,
+                    'rules': [rule for rule, count in changes]
+                })
+            
+            file_issues.extend(question_issues(quiz, quiz_file.name, difficulty, idx))
+    
+    # Save the fixed file; untouched files keep their bytes and mtime
+    diff = ''
+    if fixes:
+        if dry_run:
+            diff = ''.join(json_codec.diff_pretty(quiz_data, quiz_file))
+        else:
+            save_quiz_file(quiz_file, quiz_data)
     
-    return fixes_by_file, total_fixed
+    return fixes, file_issues, diff
 
-def validate_all_quizzes():
-    """Validate all quizzes for remaining issues"""
+def process_all_quizzes(dry_run=False, jobs=1):
+    """Fix and validate all quiz files in one pass
+    
+    Returns (fixes_by_file, total_fixed, all_issues, issues_by_type).
+    """
     quiz_files = find_quiz_files()
     
+    total_fixed = 0
+    fixes_by_file = defaultdict(list)
     all_issues = []
     issues_by_type = defaultdict(list)
     
-    for quiz_file in quiz_files:
-        print(f"\nValidating: {quiz_file.name}")
-        quiz_data = load_quiz_file(quiz_file)
-        
-        for difficulty in ['easy', 'medium', 'hard']:
-            if difficulty not in quiz_data:
-                continue
-            
-            quizzes = quiz_data[difficulty]
-            for idx, quiz in enumerate(quizzes):
-                stem = quiz['stem']
-                quiz_id = quiz.get('id', f'unknown_{idx}')
-                
-                # Check for various issues
-                issues = []
-                issues.extend(check_redundant_phrases(stem))
-                issues.extend(check_body_part_issues(stem))
-                issues.extend(check_capitalization_issues(stem))
-                
-                if issues:
-                    for issue in issues:
-                        all_issues.append({
-                            'id': quiz_id,
-                            'file': quiz_file.name,
-                            'difficulty': difficulty,
-                            'stem': stem,
-                            'choices': quiz['choices'],
-                            'correctIndex': quiz['correctIndex'],
-                            **issue
-                        })
-                        issues_by_type[issue['type']].append(quiz_id)
+    results = map_files(partial(process_quiz_file, dry_run=dry_run), quiz_files, jobs)
+    for quiz_file, (fixes, file_issues, diff) in zip(quiz_files, results):
+        print(f"\nProcessing: {quiz_file.name}")
+        sys.stdout.write(diff)
+        if fixes:
+            fixes_by_file[quiz_file.name] = fixes
+            total_fixed += len(fixes)
+            print(f"  ✓ Fixed {len(fixes)} issues")
+        else:
+            print("  ✓ No changes")
+        for issue in file_issues:
+            all_issues.append(issue)
+            issues_by_type[issue['type']].append(issue['id'])
     
-    return all_issues, issues_by_type
+    return fixes_by_file, total_fixed, all_issues, issues_by_type
 
 def main():
+    parser = argparse.ArgumentParser(description="Fix grammar quiz issues")
+    parser.add_argument('--export-dir', type=Path,
+                        help='also write minified + gzip copies of the fixed files here')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='print a unified diff of the fixes instead of writing them')
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+    
     print("="*80)
     print("FIXING GRAMMAR QUIZ ISSUES")
     print("="*80)
     
-    # Fix issues
-    fixes_by_file, total_fixed = process_all_quizzes()
+    # Fix issues and validate the fixed questions in the same pass
+    fixes_by_file, total_fixed, all_issues, issues_by_type = process_all_quizzes(args.dry_run, args.jobs)
+    fixes_by_rule = defaultdict(int)
+    for fixes in fixes_by_file.values():
+        for fix in fixes:
+            for rule in fix['rules']:
+                fixes_by_rule[rule] += 1
     
     print(f"\n{'='*80}")
     print(f"SUMMARY OF FIXES: {total_fixed} total fixes applied")
     print(f"{'='*80}")
     
+    for rule, count in sorted(fixes_by_rule.items(), key=lambda x: -x[1]):
+        print(f"  {rule}: {count}")
+    
     for filename, fixes in sorted(fixes_by_file.items()):
         if fixes:
             print(f"\n{filename}: {len(fixes)} fixes")
@@ -242,13 +270,10 @@ def main():
             if len(fixes) > 3:
                 print(f"  ... and {len(fixes) - 3} more")
     
-    # Validate again
     print(f"\n{'='*80}")
-    print("VALIDATING QUIZZES AFTER FIXES")
+    print("REMAINING ISSUES AFTER FIXES")
     print(f"{'='*80}")
     
-    all_issues, issues_by_type = validate_all_quizzes()
-    
     if all_issues:
         print(f"\n⚠️  REMAINING ISSUES FOUND: {len(all_issues)}")
         
@@ -265,11 +290,16 @@ def main():
     else:
         print("\n✅ NO ISSUES FOUND! All quizzes are valid.")
     
+    if args.dry_run:
+        print("\nDry run: no files were written")
+        return
+    
     # Save detailed report
     report = {
         'summary': {
             'total_fixed': total_fixed,
             'fixes_by_file': {k: len(v) for k, v in fixes_by_file.items()},
+            'fixes_by_rule': dict(fixes_by_rule),
             'remaining_issues': len(all_issues),
             'issues_by_type': {k: len(v) for k, v in issues_by_type.items()}
         },
@@ -278,10 +308,12 @@ def main():
     }
     
     report_path = Path('c:/Users/chawa/Downloads/App Test/eng_pocket/scripts/grammar_fixes_report.json')
-    with open(report_path, 'w', encoding='utf-8') as f:
-        json.dump(report, f, ensure_ascii=False, indent=2)
+    json_codec.dump_pretty(report, report_path)
     
     print(f"\n📄 Detailed report saved to: grammar_fixes_report.json")
+    
+    if args.export_dir:
+        export_all(find_quiz_files(), args.export_dir)
 
 if __name__ == '__main__':
     main()
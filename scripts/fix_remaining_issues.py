@@ -3,9 +3,15 @@
 """
 Fix remaining body part issues in grammar quizzes
 """
-import json
+import argparse
+import sys
+from collections import defaultdict
 from pathlib import Path
 
+import json_codec
+from quiz_export import export_all
+from stem_rules import RewriteRules
+
 # Map problematic phrases to replacements
 PHRASE_REPLACEMENTS = {
     'closing his eyes': 'helping him',
@@ -34,43 +40,55 @@ PHRASE_REPLACEMENTS = {
     'closed our eyes': 'helped us',
 }
 
-def fix_quiz_file(filepath):
-    """Fix issues in a quiz file"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+# Every phrase rewrite compiled once, tried in PHRASE_REPLACEMENTS order
+# (case-insensitive match)
+PHRASE_FIXES = RewriteRules()
+for old_phrase, replacement in PHRASE_REPLACEMENTS.items():
+    PHRASE_FIXES.phrase(old_phrase, old_phrase, replacement)
+PHRASE_FIXES.compile()
+
+def fix_quiz_file(filepath, dry_run=False):
+    """Fix issues in a quiz file, return the fixes as {'id', 'difficulty', 'rules'}
+    
+    The file is only rewritten when a stem changed; with dry_run the diff is
+    printed instead.
+    """
+    data = json_codec.load(filepath)
     
-    fixed_count = 0
+    fixes = []
     
     for difficulty in ['easy', 'medium', 'hard']:
         if difficulty not in data:
             continue
         
         quizzes = data[difficulty]
-        for quiz in quizzes:
-            original_stem = quiz['stem']
-            fixed_stem = original_stem
-            
-            # Replace problematic phrases (case-insensitive but preserve case)
-            for old_phrase, new_phrase in PHRASE_REPLACEMENTS.items():
-                if old_phrase.lower() in fixed_stem.lower():
-                    # Find and replace while preserving case
-                    import re
-                    pattern = re.compile(re.escape(old_phrase), re.IGNORECASE)
-                    if pattern.search(fixed_stem):
-                        fixed_stem = pattern.sub(new_phrase, fixed_stem)
-                        fixed_count += 1
-                        break
-            
-            if fixed_stem != original_stem:
+        for idx, quiz in enumerate(quizzes):
+            fixed_stem, changes = PHRASE_FIXES.apply(quiz['stem'])
+            if changes:
                 quiz['stem'] = fixed_stem
+                fixes.append({
+                    'id': quiz.get('id', f'unknown_{idx}'),
+                    'difficulty': difficulty,
+                    'rules': [rule for rule, count in changes]
+                })
     
     # Save the fixed file
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    if fixes:
+        if dry_run:
+            sys.stdout.writelines(json_codec.diff_pretty(data, filepath))
+        else:
+            json_codec.dump_pretty(data, filepath)
     
-    return fixed_count
+    return fixes
 
 def main():
+    parser = argparse.ArgumentParser(description="Fix remaining body part issues")
+    parser.add_argument('--export-dir', type=Path,
+                        help='also write minified + gzip copies of the fixed files here')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='print a unified diff of the fixes instead of writing them')
+    args = parser.parse_args()
+    
     quiz_dir = Path('c:/Users/chawa/Downloads/App Test/eng_pocket/assets/data/quiz')
     quiz_files = sorted(quiz_dir.glob('grammar_quiz_*.json'))
     
@@ -79,15 +97,26 @@ def main():
     print("="*80)
     
     total_fixed = 0
+    fixes_by_rule = defaultdict(int)
     for quiz_file in quiz_files:
-        fixed = fix_quiz_file(quiz_file)
-        if fixed > 0:
-            print(f"{quiz_file.name}: {fixed} fixes")
-            total_fixed += fixed
+        fixes = fix_quiz_file(quiz_file, args.dry_run)
+        if fixes:
+            print(f"{quiz_file.name}: {len(fixes)} fixes")
+            total_fixed += len(fixes)
+        for fix in fixes:
+            for rule in fix['rules']:
+                fixes_by_rule[rule] += 1
     
     print(f"\n{'='*80}")
     print(f"TOTAL FIXED: {total_fixed}")
     print(f"{'='*80}")
+    for rule, count in sorted(fixes_by_rule.items(), key=lambda x: -x[1]):
+        print(f"  {rule}: {count}")
+    
+    if args.dry_run:
+        print("Dry run: no files were written")
+    elif args.export_dir:
+        export_all(quiz_files, args.export_dir)
 
 if __name__ == '__main__':
     main()
@@ -3,14 +3,14 @@
 """
 Generate comprehensive validation report for all quiz files
 """
-import json
 from pathlib import Path
 from collections import defaultdict
 
+import json_codec
+
 def load_quiz_file(filepath):
     """Load quiz JSON file"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return json_codec.load(filepath)
 
 def count_quizzes(quiz_data):
     """Count total quizzes"""
@@ -101,8 +101,7 @@ def main():
     }
     
     report_path = Path('c:/Users/chawa/Downloads/App Test/eng_pocket/scripts/validation_report.json')
-    with open(report_path, 'w', encoding='utf-8') as f:
-        json.dump(report, f, ensure_ascii=False, indent=2)
+    json_codec.dump_pretty(report, report_path)
     
     print("\n📄 Report saved to: validation_report.json")
 
@@ -3,10 +3,11 @@
 """
 Generate comprehensive final validation report
 """
-import json
 from pathlib import Path
 from datetime import datetime
 
+import json_codec
+
 def main():
     script_dir = Path('c:/Users/chawa/Downloads/App Test/eng_pocket/scripts')
     
@@ -16,20 +17,17 @@ def main():
     # Load smart content validation
     smart_report_path = script_dir / 'smart_content_validation.json'
     if smart_report_path.exists():
-        with open(smart_report_path, 'r', encoding='utf-8') as f:
-            reports['content'] = json.load(f)
+        reports['content'] = json_codec.load(smart_report_path)
     
     # Load grammar fixes report
     grammar_fixes_path = script_dir / 'grammar_fixes_report.json'
     if grammar_fixes_path.exists():
-        with open(grammar_fixes_path, 'r', encoding='utf-8') as f:
-            reports['grammar_fixes'] = json.load(f)
+        reports['grammar_fixes'] = json_codec.load(grammar_fixes_path)
     
     # Load validation report
     validation_path = script_dir / 'validation_report.json'
     if validation_path.exists():
-        with open(validation_path, 'r', encoding='utf-8') as f:
-            reports['validation'] = json.load(f)
+        reports['validation'] = json_codec.load(validation_path)
     
     # Generate comprehensive report
     print("="*100)
@@ -132,8 +130,7 @@ def main():
     }
     
     report_path = Path('c:/Users/chawa/Downloads/App Test/eng_pocket/scripts/FINAL_VALIDATION_REPORT.json')
-    with open(report_path, 'w', encoding='utf-8') as f:
-        json.dump(final_report, f, ensure_ascii=False, indent=2)
+    json_codec.dump_pretty(final_report, report_path)
     
     print("📄 Report saved: FINAL_VALIDATION_REPORT.json")
 
@@ -4,10 +4,21 @@ Grammar Quiz Generator
 Generates 5,000 questions per tense for 13 grammar topics (65,000 total)
 """
 
+import argparse
+import hashlib
+import inspect
 import json
 import random
 import os
-from typing import List, Dict, Tuple
+import re
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Tuple, Iterable, Iterator
+
+import json_codec
+from quiz_export import export_all
 
 # ===== VOCABULARY DATA =====
 
@@ -243,11 +254,11 @@ TENSES = [
 
 # ===== QUESTION GENERATORS =====
 
-def generate_present_simple(verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
+def generate_present_simple(rng: random.Random, verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
     """Generate a Present Simple question"""
-    subject = random.choice(SUBJECTS_SINGULAR if is_singular else SUBJECTS_PLURAL)
-    obj = random.choice(OBJECTS)
-    time = random.choice(TIME_PRESENT)
+    subject = rng.choice(SUBJECTS_SINGULAR if is_singular else SUBJECTS_PLURAL)
+    obj = rng.choice(OBJECTS)
+    time = rng.choice(TIME_PRESENT)
     
     correct = verb["v1_s"] if is_singular else verb["v1"]
     
@@ -255,7 +266,7 @@ def generate_present_simple(verb_key: str, verb: dict, is_singular: bool, diffic
         stem = f"{subject} _____ {obj} {time}."
         explanation = f"ใช้ '{correct}' เพราะ{'ประธานเป็นเอกพจน์บุรุษที่ 3 ต้องเติม -s/-es' if is_singular else 'ประธานเป็นพหูพจน์ ใช้ V1'}"
     elif difficulty == "medium":
-        freq = random.choice(FREQUENCY)
+        freq = rng.choice(FREQUENCY)
         stem = f"{subject} {freq} _____ {obj}."
         explanation = f"ใช้ '{correct}' เพราะมีคำบ่งชี้ '{freq}' แสดงกิจวัตร"
     else:  # hard
@@ -275,9 +286,9 @@ def generate_present_simple(verb_key: str, verb: dict, is_singular: bool, diffic
             choices.append(d)
     
     while len(choices) < 4:
-        choices.append(random.choice(list(VERBS_BASE.values()))["v1"])
+        choices.append(rng.choice(list(VERBS_BASE.values()))["v1"])
     
-    random.shuffle(choices)
+    rng.shuffle(choices)
     correct_index = choices.index(correct)
     
     return {
@@ -288,11 +299,11 @@ def generate_present_simple(verb_key: str, verb: dict, is_singular: bool, diffic
     }
 
 
-def generate_present_continuous(verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
+def generate_present_continuous(rng: random.Random, verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
     """Generate a Present Continuous question"""
-    subject = random.choice(SUBJECTS_SINGULAR if is_singular else SUBJECTS_PLURAL)
-    obj = random.choice(OBJECTS)
-    time = random.choice(TIME_CONTINUOUS)
+    subject = rng.choice(SUBJECTS_SINGULAR if is_singular else SUBJECTS_PLURAL)
+    obj = rng.choice(OBJECTS)
+    time = rng.choice(TIME_CONTINUOUS)
     
     be_verb = "is" if is_singular else ("am" if subject == "I" else "are")
     correct = f"{be_verb} {verb['ving']}"
@@ -320,7 +331,7 @@ def generate_present_continuous(verb_key: str, verb: dict, is_singular: bool, di
         if d not in choices and len(choices) < 4:
             choices.append(d)
     
-    random.shuffle(choices)
+    rng.shuffle(choices)
     correct_index = choices.index(correct)
     
     return {
@@ -331,11 +342,11 @@ def generate_present_continuous(verb_key: str, verb: dict, is_singular: bool, di
     }
 
 
-def generate_present_perfect(verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
+def generate_present_perfect(rng: random.Random, verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
     """Generate a Present Perfect question"""
-    subject = random.choice(SUBJECTS_SINGULAR if is_singular else SUBJECTS_PLURAL)
-    obj = random.choice(OBJECTS)
-    time = random.choice(TIME_PERFECT)
+    subject = rng.choice(SUBJECTS_SINGULAR if is_singular else SUBJECTS_PLURAL)
+    obj = rng.choice(OBJECTS)
+    time = rng.choice(TIME_PERFECT)
     
     have_verb = "has" if is_singular else "have"
     correct = f"{have_verb} {verb['v3']}"
@@ -364,7 +375,7 @@ def generate_present_perfect(verb_key: str, verb: dict, is_singular: bool, diffi
         if d not in choices and len(choices) < 4:
             choices.append(d)
     
-    random.shuffle(choices)
+    rng.shuffle(choices)
     correct_index = choices.index(correct)
     
     return {
@@ -375,10 +386,10 @@ def generate_present_perfect(verb_key: str, verb: dict, is_singular: bool, diffi
     }
 
 
-def generate_present_perfect_continuous(verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
+def generate_present_perfect_continuous(rng: random.Random, verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
     """Generate a Present Perfect Continuous question"""
-    subject = random.choice(SUBJECTS_SINGULAR if is_singular else SUBJECTS_PLURAL)
-    duration = random.choice(DURATION)
+    subject = rng.choice(SUBJECTS_SINGULAR if is_singular else SUBJECTS_PLURAL)
+    duration = rng.choice(DURATION)
     
     have_verb = "has" if is_singular else "have"
     correct = f"{have_verb} been {verb['ving']}"
@@ -406,7 +417,7 @@ def generate_present_perfect_continuous(verb_key: str, verb: dict, is_singular:
         if d not in choices and len(choices) < 4:
             choices.append(d)
     
-    random.shuffle(choices)
+    rng.shuffle(choices)
     correct_index = choices.index(correct)
     
     return {
@@ -417,11 +428,11 @@ def generate_present_perfect_continuous(verb_key: str, verb: dict, is_singular:
     }
 
 
-def generate_past_simple(verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
+def generate_past_simple(rng: random.Random, verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
     """Generate a Past Simple question"""
-    subject = random.choice(SUBJECTS_SINGULAR if is_singular else SUBJECTS_PLURAL)
-    obj = random.choice(OBJECTS)
-    time = random.choice(TIME_PAST)
+    subject = rng.choice(SUBJECTS_SINGULAR if is_singular else SUBJECTS_PLURAL)
+    obj = rng.choice(OBJECTS)
+    time = rng.choice(TIME_PAST)
     
     correct = verb["v2"]
     
@@ -448,7 +459,7 @@ def generate_past_simple(verb_key: str, verb: dict, is_singular: bool, difficult
         if d not in choices and len(choices) < 4:
             choices.append(d)
     
-    random.shuffle(choices)
+    rng.shuffle(choices)
     correct_index = choices.index(correct)
     
     return {
@@ -459,10 +470,10 @@ def generate_past_simple(verb_key: str, verb: dict, is_singular: bool, difficult
     }
 
 
-def generate_past_continuous(verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
+def generate_past_continuous(rng: random.Random, verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
     """Generate a Past Continuous question"""
-    subject = random.choice(SUBJECTS_SINGULAR if is_singular else SUBJECTS_PLURAL)
-    obj = random.choice(OBJECTS)
+    subject = rng.choice(SUBJECTS_SINGULAR if is_singular else SUBJECTS_PLURAL)
+    obj = rng.choice(OBJECTS)
     
     be_verb = "was" if is_singular or subject == "I" else "were"
     correct = f"{be_verb} {verb['ving']}"
@@ -490,7 +501,7 @@ def generate_past_continuous(verb_key: str, verb: dict, is_singular: bool, diffi
         if d not in choices and len(choices) < 4:
             choices.append(d)
     
-    random.shuffle(choices)
+    rng.shuffle(choices)
     correct_index = choices.index(correct)
     
     return {
@@ -501,10 +512,10 @@ def generate_past_continuous(verb_key: str, verb: dict, is_singular: bool, diffi
     }
 
 
-def generate_past_perfect(verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
+def generate_past_perfect(rng: random.Random, verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
     """Generate a Past Perfect question"""
-    subject = random.choice(SUBJECTS_SINGULAR if is_singular else SUBJECTS_PLURAL)
-    obj = random.choice(OBJECTS)
+    subject = rng.choice(SUBJECTS_SINGULAR if is_singular else SUBJECTS_PLURAL)
+    obj = rng.choice(OBJECTS)
     
     correct = f"had {verb['v3']}"
     
@@ -531,7 +542,7 @@ def generate_past_perfect(verb_key: str, verb: dict, is_singular: bool, difficul
         if d not in choices and len(choices) < 4:
             choices.append(d)
     
-    random.shuffle(choices)
+    rng.shuffle(choices)
     correct_index = choices.index(correct)
     
     return {
@@ -542,10 +553,10 @@ def generate_past_perfect(verb_key: str, verb: dict, is_singular: bool, difficul
     }
 
 
-def generate_past_perfect_continuous(verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
+def generate_past_perfect_continuous(rng: random.Random, verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
     """Generate a Past Perfect Continuous question"""
-    subject = random.choice(SUBJECTS_SINGULAR if is_singular else SUBJECTS_PLURAL)
-    duration = random.choice(DURATION)
+    subject = rng.choice(SUBJECTS_SINGULAR if is_singular else SUBJECTS_PLURAL)
+    duration = rng.choice(DURATION)
     
     correct = f"had been {verb['ving']}"
     
@@ -572,7 +583,7 @@ def generate_past_perfect_continuous(verb_key: str, verb: dict, is_singular: boo
         if d not in choices and len(choices) < 4:
             choices.append(d)
     
-    random.shuffle(choices)
+    rng.shuffle(choices)
     correct_index = choices.index(correct)
     
     return {
@@ -583,11 +594,11 @@ def generate_past_perfect_continuous(verb_key: str, verb: dict, is_singular: boo
     }
 
 
-def generate_future_simple(verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
+def generate_future_simple(rng: random.Random, verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
     """Generate a Future Simple question"""
-    subject = random.choice(SUBJECTS_SINGULAR if is_singular else SUBJECTS_PLURAL)
-    obj = random.choice(OBJECTS)
-    time = random.choice(TIME_FUTURE)
+    subject = rng.choice(SUBJECTS_SINGULAR if is_singular else SUBJECTS_PLURAL)
+    obj = rng.choice(OBJECTS)
+    time = rng.choice(TIME_FUTURE)
     
     correct = f"will {verb['v1']}"
     
@@ -613,7 +624,7 @@ def generate_future_simple(verb_key: str, verb: dict, is_singular: bool, difficu
         if d not in choices and len(choices) < 4:
             choices.append(d)
     
-    random.shuffle(choices)
+    rng.shuffle(choices)
     correct_index = choices.index(correct)
     
     return {
@@ -624,10 +635,10 @@ def generate_future_simple(verb_key: str, verb: dict, is_singular: bool, difficu
     }
 
 
-def generate_future_continuous(verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
+def generate_future_continuous(rng: random.Random, verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
     """Generate a Future Continuous question"""
-    subject = random.choice(SUBJECTS_SINGULAR if is_singular else SUBJECTS_PLURAL)
-    obj = random.choice(OBJECTS)
+    subject = rng.choice(SUBJECTS_SINGULAR if is_singular else SUBJECTS_PLURAL)
+    obj = rng.choice(OBJECTS)
     
     correct = f"will be {verb['ving']}"
     
@@ -654,7 +665,7 @@ def generate_future_continuous(verb_key: str, verb: dict, is_singular: bool, dif
         if d not in choices and len(choices) < 4:
             choices.append(d)
     
-    random.shuffle(choices)
+    rng.shuffle(choices)
     correct_index = choices.index(correct)
     
     return {
@@ -665,10 +676,10 @@ def generate_future_continuous(verb_key: str, verb: dict, is_singular: bool, dif
     }
 
 
-def generate_future_perfect(verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
+def generate_future_perfect(rng: random.Random, verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
     """Generate a Future Perfect question"""
-    subject = random.choice(SUBJECTS_SINGULAR if is_singular else SUBJECTS_PLURAL)
-    obj = random.choice(OBJECTS)
+    subject = rng.choice(SUBJECTS_SINGULAR if is_singular else SUBJECTS_PLURAL)
+    obj = rng.choice(OBJECTS)
     
     correct = f"will have {verb['v3']}"
     
@@ -695,7 +706,7 @@ def generate_future_perfect(verb_key: str, verb: dict, is_singular: bool, diffic
         if d not in choices and len(choices) < 4:
             choices.append(d)
     
-    random.shuffle(choices)
+    rng.shuffle(choices)
     correct_index = choices.index(correct)
     
     return {
@@ -706,10 +717,10 @@ def generate_future_perfect(verb_key: str, verb: dict, is_singular: bool, diffic
     }
 
 
-def generate_future_perfect_continuous(verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
+def generate_future_perfect_continuous(rng: random.Random, verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
     """Generate a Future Perfect Continuous question"""
-    subject = random.choice(SUBJECTS_SINGULAR if is_singular else SUBJECTS_PLURAL)
-    duration = random.choice(DURATION)
+    subject = rng.choice(SUBJECTS_SINGULAR if is_singular else SUBJECTS_PLURAL)
+    duration = rng.choice(DURATION)
     
     correct = f"will have been {verb['ving']}"
     
@@ -736,7 +747,7 @@ def generate_future_perfect_continuous(verb_key: str, verb: dict, is_singular: b
         if d not in choices and len(choices) < 4:
             choices.append(d)
     
-    random.shuffle(choices)
+    rng.shuffle(choices)
     correct_index = choices.index(correct)
     
     return {
@@ -747,10 +758,10 @@ def generate_future_perfect_continuous(verb_key: str, verb: dict, is_singular: b
     }
 
 
-def generate_passive_voice(verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
+def generate_passive_voice(rng: random.Random, verb_key: str, verb: dict, is_singular: bool, difficulty: str) -> dict:
     """Generate a Passive Voice question"""
-    subject = random.choice(OBJECTS)  # For passive, object becomes subject
-    agent = random.choice(SUBJECTS_SINGULAR + SUBJECTS_PLURAL)
+    subject = rng.choice(OBJECTS)  # For passive, object becomes subject
+    agent = rng.choice(SUBJECTS_SINGULAR + SUBJECTS_PLURAL)
     
     be_verb = "is" if is_singular else "are"
     correct = f"{be_verb} {verb['v3']}"
@@ -779,7 +790,7 @@ def generate_passive_voice(verb_key: str, verb: dict, is_singular: bool, difficu
         if d not in choices and len(choices) < 4:
             choices.append(d)
     
-    random.shuffle(choices)
+    rng.shuffle(choices)
     correct_index = choices.index(correct)
     
     return {
@@ -808,62 +819,350 @@ GENERATORS = {
     "passive_voice": generate_passive_voice,
 }
 
+VERB_ITEMS = list(VERBS_BASE.items())
 
-def generate_questions_for_tense(tense: dict, count: int = 5000) -> dict:
-    """Generate questions for a specific tense"""
-    tense_name = tense["name"]
-    pack_id = tense["pack_id"]
-    generator = GENERATORS[tense_name]
-    
+
+def difficulty_counts(count: int) -> Dict[str, int]:
+    """Split a per-tense question count across difficulties"""
     # Distribution: easy 1500, medium 2000, hard 1500
-    difficulties = {
+    return {
         "easy": int(count * 0.3),
         "medium": int(count * 0.4),
         "hard": int(count * 0.3)
     }
+
+
+def question_rng(tense: dict, difficulty: str, index: int, seed: int = 0) -> random.Random:
+    """Build the RNG for one question, seeded from tense id, difficulty and index"""
+    return random.Random(f"{seed}:{tense['id']}:{difficulty}:{index}")
+
+
+def generate_question(tense: dict, difficulty: str, index: int, seed: int = 0) -> dict:
+    """Generate the question at a 0-based index of a tense/difficulty"""
+    pack_id = tense["pack_id"]
+    generator = GENERATORS[tense["name"]]
+    rng = question_rng(tense, difficulty, index, seed)
+    
+    verb_key, verb = rng.choice(VERB_ITEMS)
+    is_singular = rng.choice([True, False])
     
-    questions = {"easy": [], "medium": [], "hard": []}
-    verbs = list(VERBS_BASE.items())
+    q = generator(rng, verb_key, verb, is_singular, difficulty)
+    q["id"] = f"q_{pack_id}_{difficulty[0]}_{index+1}"
+    q["skillType"] = "grammar"
+    q["packId"] = pack_id
     
-    for difficulty, num in difficulties.items():
+    return q
+
+
+def regenerate_question(question_id: str, seed: int = 0) -> dict:
+    """Rebuild a single question from its id, e.g. q_grammar_001_e_12"""
+    match = re.fullmatch(r"q_(grammar_\d+)_([emh])_(\d+)", question_id)
+    if not match:
+        raise ValueError(f"Not a generated question id: {question_id}")
+    
+    pack_id, letter, number = match.groups()
+    tense = next((t for t in TENSES if t["pack_id"] == pack_id), None)
+    if tense is None:
+        raise ValueError(f"Unknown pack id: {pack_id}")
+    difficulty = {"e": "easy", "m": "medium", "h": "hard"}[letter]
+    
+    return generate_question(tense, difficulty, int(number) - 1, seed)
+
+
+def generate_questions_for_difficulty(tense: dict, difficulty: str, num: int, seed: int = 0) -> List[dict]:
+    """Generate the questions of one difficulty for a specific tense"""
+    return [generate_question(tense, difficulty, i, seed) for i in range(num)]
+
+
+def generate_questions_for_tense(tense: dict, count: int = 5000, seed: int = 0) -> dict:
+    """Generate questions for a specific tense"""
+    questions = {}
+    
+    for difficulty, num in difficulty_counts(count).items():
         print(f"  Generating {num} {difficulty} questions...")
-        for i in range(num):
-            verb_key, verb = random.choice(verbs)
-            is_singular = random.choice([True, False])
-            
-            q = generator(verb_key, verb, is_singular, difficulty)
-            q["id"] = f"q_{pack_id}_{difficulty[0]}_{i+1}"
-            q["skillType"] = "grammar"
-            q["packId"] = pack_id
-            
-            questions[difficulty].append(q)
+        questions[difficulty] = generate_questions_for_difficulty(tense, difficulty, num, seed)
     
     return questions
 
 
+# Questions per process pool task; also bounds how many questions are held in memory
+CHUNK_SIZE = 1000
+
+
+def _generate_unit(unit: Tuple[dict, str, int, int, int]) -> List[dict]:
+    """Process pool entry point for one (tense, difficulty, start, stop, seed) work unit"""
+    tense, difficulty, start, stop, seed = unit
+    return [generate_question(tense, difficulty, i, seed) for i in range(start, stop)]
+
+
+def run_units(units: List[tuple], workers: int = 1) -> Iterator[List[dict]]:
+    """Yield work unit results in order, keeping at most 2 * workers units in flight"""
+    if workers <= 1:
+        yield from map(_generate_unit, units)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for unit in units:
+            pending.append(executor.submit(_generate_unit, unit))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def generate_all_tenses(count: int = 5000, workers: int = 1, seed: int = 0, tenses: List[dict] = TENSES):
+    """Yield (tense, sections) for every tense, spreading work over a process pool
+    
+    sections lazily yields (difficulty, questions) and must be consumed in order
+    before moving on to the next tense.
+    """
+    counts = difficulty_counts(count)
+    units = [
+        (tense, difficulty, start, min(start + CHUNK_SIZE, num), seed)
+        for tense in tenses
+        for difficulty, num in counts.items()
+        for start in range(0, num, CHUNK_SIZE)
+    ]
+    chunks = run_units(units, workers)
+    
+    def sections():
+        for difficulty, num in counts.items():
+            num_chunks = -(-num // CHUNK_SIZE)
+            yield difficulty, (q for _ in range(num_chunks) for q in next(chunks))
+    
+    for tense in tenses:
+        yield tense, sections()
+
+
+def tense_basename(tense: dict) -> str:
+    """File name stem shared by a tense's quiz file and shard directory"""
+    return f"grammar_quiz_{tense['id'].replace('grammar_', '')}_{tense['name']}"
+
+
+def write_quiz_file(filename: str, sections: Iterable[Tuple[str, Iterable[dict]]]) -> int:
+    """Stream questions to a quiz file as they are generated
+    
+    Produces the same bytes as json.dump(questions, f, ensure_ascii=False, indent=2)
+    on the {"easy": [...], "medium": [...], "hard": [...]} layout. Returns the
+    number of questions written. The file is streamed to <filename>.tmp and
+    moved into place at the end, so an interrupted run never leaves a
+    truncated quiz file behind.
+    """
+    total = 0
+    num_sections = 0
+    tmp_filename = f"{filename}.tmp"
+    try:
+        with open(tmp_filename, 'w', encoding='utf-8') as f:
+            f.write("{")
+            for difficulty, questions in sections:
+                f.write(f"{',' if num_sections else ''}\n  {json.dumps(difficulty, ensure_ascii=False)}: [")
+                count = 0
+                for q in questions:
+                    body = json_codec.dumps_pretty(q).replace("\n", "\n    ")
+                    f.write(f"{',' if count else ''}\n    {body}")
+                    count += 1
+                f.write("\n  ]" if count else "]")
+                total += count
+                num_sections += 1
+            f.write("\n}" if num_sections else "}")
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+        raise
+    return total
+
+
+def write_sharded_quiz(output_dir: str, tense: dict, sections: Iterable[Tuple[str, Iterable[dict]]],
+                       shard_size: int) -> int:
+    """Stream a tense into fixed-size shards per difficulty plus a paged index file
+    
+    Shards go to <output_dir>/<basename>/<difficulty>_NNN.json, each with the usual
+    {"<difficulty>": [...]} layout, and index.json in the same directory lists
+    every shard's path (relative to output_dir), count and id range.
+    """
+    basename = tense_basename(tense)
+    shard_dir = Path(output_dir) / basename
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    for old_shard in shard_dir.glob("*_[0-9][0-9][0-9].json"):
+        old_shard.unlink()
+    
+    index = {"packId": tense["pack_id"], "shardSize": shard_size, "total": 0, "shards": {}}
+    for difficulty, questions in sections:
+        questions = iter(questions)
+        entries = []
+        while True:
+            shard = list(islice(questions, shard_size))
+            if not shard:
+                break
+            path = f"{basename}/{difficulty}_{len(entries):03d}.json"
+            write_quiz_file(f"{output_dir}/{path}", [(difficulty, shard)])
+            entries.append({
+                "path": path,
+                "count": len(shard),
+                "firstId": shard[0]["id"],
+                "lastId": shard[-1]["id"],
+            })
+            index["total"] += len(shard)
+        index["shards"][difficulty] = entries
+    
+    json_codec.dump_pretty(index, shard_dir / "index.json")
+    
+    return index["total"]
+
+
+# ===== BUILD MANIFEST =====
+
+MANIFEST_PATH = Path(__file__).parent / "grammar_quiz_manifest.json"
+
+# Word lists every generator draws from
+SHARED_INPUTS = {
+    "SUBJECTS_SINGULAR": SUBJECTS_SINGULAR,
+    "SUBJECTS_PLURAL": SUBJECTS_PLURAL,
+    "VERBS_BASE": VERBS_BASE,
+    "OBJECTS": OBJECTS,
+    "TIME_PRESENT": TIME_PRESENT,
+    "TIME_PAST": TIME_PAST,
+    "TIME_FUTURE": TIME_FUTURE,
+    "TIME_CONTINUOUS": TIME_CONTINUOUS,
+    "TIME_PERFECT": TIME_PERFECT,
+    "DURATION": DURATION,
+    "FREQUENCY": FREQUENCY,
+}
+
+# Code shared by all tenses that decides what ends up in a file
+SHARED_CODE = [difficulty_counts, question_rng, generate_question, write_quiz_file, write_sharded_quiz]
+
+
+def output_name(tense: dict, shard_size: int = 0) -> str:
+    """Path of a tense's quiz file (or shard index) relative to the output directory
+    
+    Also the tense's manifest key, so the same build run from another working
+    directory, or with an absolute --output-dir, still finds its entries.
+    """
+    if shard_size:
+        return f"{tense_basename(tense)}/index.json"
+    return f"{tense_basename(tense)}.json"
+
+
+def output_filename(output_dir: str, tense: dict, shard_size: int = 0) -> str:
+    """Path of the quiz file for a tense, or of its shard index when sharding"""
+    return f"{output_dir}/{output_name(tense, shard_size)}"
+
+
+def tense_input_hash(tense: dict, count: int, seed: int, shard_size: int = 0) -> str:
+    """Content hash of everything that determines a tense's quiz file"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps({
+        "tense": tense,
+        "count": count,
+        "seed": seed,
+        "shard_size": shard_size,
+        "inputs": SHARED_INPUTS,
+    }, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+    for func in SHARED_CODE + [GENERATORS[tense["name"]]]:
+        digest.update(inspect.getsource(func).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_manifest(path: Path) -> dict:
+    """Load the build manifest, or an empty one if there is none yet"""
+    if not path.exists():
+        return {}
+    return json_codec.load(path)
+
+
+def save_manifest(path: Path, manifest: dict):
+    """Save the build manifest"""
+    json_codec.dump_pretty(manifest, path, sort_keys=True)
+
+
+def stale_tenses(manifest: dict, output_dir: str, count: int, seed: int, shard_size: int = 0) -> List[dict]:
+    """Tenses whose output file is missing or whose inputs changed since the last build"""
+    stale = []
+    for tense in TENSES:
+        filename = output_filename(output_dir, tense, shard_size)
+        key = output_name(tense, shard_size)
+        if (not os.path.exists(filename)
+                or manifest.get(key) != tense_input_hash(tense, count, seed, shard_size)):
+            stale.append(tense)
+    return stale
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate grammar quiz banks")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of worker processes (default: 1)")
+    parser.add_argument("--count", type=int, default=5000,
+                        help="questions per tense (default: 5000)")
+    parser.add_argument("--shard-size", type=int, default=0,
+                        help="split each difficulty into shards of this many questions "
+                             "with an index.json per tense (default: one file per tense)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="base seed mixed into every question's RNG (default: 0)")
+    parser.add_argument("--output-dir", default="assets/data/quiz",
+                        help="directory for the generated quiz files")
+    parser.add_argument("--manifest", type=Path, default=MANIFEST_PATH,
+                        help="build manifest used to skip unchanged tenses")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild every tense even if its inputs are unchanged")
+    parser.add_argument("--export-dir", type=Path,
+                        help="also write minified + gzip copies of every quiz file here; with "
+                             "--shard-size the shard directories and their index.json are "
+                             "exported (Flutter does not bundle subdirectories of a listed "
+                             "asset directory, so list each shard directory in pubspec.yaml)")
+    return parser.parse_args()
+
+
 def main():
-    output_dir = "assets/data/quiz"
+    args = parse_args()
+    output_dir = args.output_dir
     os.makedirs(output_dir, exist_ok=True)
     
     print("=" * 60)
     print("Grammar Quiz Generator")
     print("=" * 60)
-    print(f"Generating 5,000 questions per tense ({len(TENSES)} tenses)")
-    print(f"Total: {5000 * len(TENSES):,} questions")
+    print(f"Generating {args.count:,} questions per tense ({len(TENSES)} tenses)")
+    print(f"Total: {args.count * len(TENSES):,} questions")
+    print(f"Workers: {args.workers}, seed: {args.seed}")
     print("=" * 60)
     
-    for tense in TENSES:
+    manifest = load_manifest(args.manifest)
+    if args.force:
+        tenses = TENSES
+    else:
+        tenses = stale_tenses(manifest, output_dir, args.count, args.seed, args.shard_size)
+        print(f"{len(TENSES) - len(tenses)} tenses unchanged, rebuilding {len(tenses)}")
+    
+    for tense, sections in generate_all_tenses(args.count, args.workers, args.seed, tenses):
         print(f"\nProcessing: {tense['title']}")
-        questions = generate_questions_for_tense(tense, 5000)
         
-        filename = f"{output_dir}/grammar_quiz_{tense['id'].replace('grammar_', '')}_{tense['name']}.json"
+        filename = output_filename(output_dir, tense, args.shard_size)
+        # Forget the old build first: if this one is interrupted (a sharded
+        # tense replaces its shards one by one) the next run rebuilds it
+        key = output_name(tense, args.shard_size)
+        if manifest.pop(key, None) is not None:
+            save_manifest(args.manifest, manifest)
+        if args.shard_size:
+            total = write_sharded_quiz(output_dir, tense, sections, args.shard_size)
+        else:
+            total = write_quiz_file(filename, sections)
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(questions, f, ensure_ascii=False, indent=2)
+        manifest[key] = tense_input_hash(tense, args.count, args.seed, args.shard_size)
+        save_manifest(args.manifest, manifest)
         
-        total = sum(len(q) for q in questions.values())
         print(f"  Saved {total:,} questions to {filename}")
     
+    if args.export_dir:
+        if args.shard_size:
+            shard_files = [path for tense in TENSES
+                           for path in sorted((Path(output_dir) / tense_basename(tense)).glob("*.json"))]
+            export_all(shard_files, args.export_dir, root=output_dir)
+        else:
+            quiz_files = [output_filename(output_dir, tense) for tense in TENSES]
+            export_all([f for f in quiz_files if os.path.exists(f)], args.export_dir)
+    
     print("\n" + "=" * 60)
     print("Generation complete!")
     print("=" * 60)
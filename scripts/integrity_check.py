@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cross-asset referential integrity checker
+Sweeps every asset once, building hash maps of ids, packIds and words, then
+reports collisions, dangling references and orphans. Every check is a dict
+lookup, so the whole pass is linear in the number of records.
+
+Checks:
+    duplicate_id        an id used twice within one namespace (vocab, quiz,
+                        exam question, passage, topic, exam pack)
+    duplicate_word      the same vocab word and part of speech in two entries
+    dangling_pack       a quiz packId with no grammar topic, or an exam
+                        question packId with no exam pack / topic
+    pack_mismatch       a question whose packId differs from the pack or
+                        topic it is stored in
+    orphan_topic        a grammar topic with no quiz bank questions
+    empty_pack          an exam pack with no questions
+    question_count      an exam pack whose numQuestions differs from its
+                        actual question count
+"""
+import argparse
+from collections import defaultdict
+from pathlib import Path
+
+from content_validation import find_content_files, iter_records, summarize
+import json_codec
+
+REPORT_PATH = Path(__file__).parent / "integrity_report.json"
+
+# record kind -> id namespace
+NAMESPACES = {
+    'vocab_item': 'vocab',
+    'quiz_question': 'quiz_question',
+    'exam_question': 'exam_question',
+    'reading_question': 'reading_question',
+    'passage': 'passage',
+    'grammar_topic': 'grammar_topic',
+}
+
+
+class ContentIndex:
+    """Hash maps of every id, packId and word, filled in one sweep"""
+
+    def __init__(self):
+        self.ids = defaultdict(dict)             # namespace -> {id: first file}
+        self.collisions = []                     # (namespace, id, file, first file)
+        self.words = {}                          # (word, pos) -> (file, id)
+        self.word_collisions = []                # (word, pos, file, id, first file, first id)
+        self.pack_refs = defaultdict(list)       # kind -> [(packId, file, id, container)]
+        self.quiz_packs = set()                  # packIds used by quiz banks
+        self.exam_packs = {}                     # pack id -> (file, declared count)
+        self.pack_sizes = defaultdict(int)       # exam pack id -> questions found
+
+    def add_id(self, namespace, record_id, file_name):
+        if record_id is None:
+            return
+        ids = self.ids[namespace]
+        if record_id in ids:
+            self.collisions.append((namespace, record_id, file_name, ids[record_id]))
+        else:
+            ids[record_id] = file_name
+
+    def add_file(self, file_name, data):
+        """Index every record of one loaded asset"""
+        for kind, record, context in iter_records(file_name, data):
+            source = context.get('file', file_name)
+            record_id = record.get('id')
+            self.add_id(NAMESPACES[kind], record_id, source)
+
+            if kind == 'vocab_item':
+                word = (record.get('word') or '').strip().lower()
+                pos = record.get('pos') or record.get('partOfSpeech') or ''
+                if word:
+                    first = self.words.setdefault((word, pos), (source, record_id))
+                    if first != (source, record_id):
+                        self.word_collisions.append((word, pos, source, record_id, *first))
+
+            elif kind == 'quiz_question':
+                self.quiz_packs.add(record.get('packId'))
+
+            elif kind == 'exam_question':
+                container = context.get('pack') or context.get('topic')
+                self.pack_refs[kind].append((record.get('packId'), source, record_id, container))
+
+        if file_name.startswith('exam_pack'):
+            for pack in data.get('packs', []) + data.get('examPacks', []):
+                self.add_id('exam_pack', pack.get('id'), file_name)
+                self.exam_packs[pack.get('id')] = (file_name, pack.get('numQuestions'))
+            # Flat files hold one pack and its questions side by side
+            for q in data.get('questions', []):
+                self.pack_sizes[q.get('packId')] += 1
+            for pack in data.get('examPacks', []):
+                self.pack_sizes[pack.get('id')] += len(pack.get('questions', []))
+
+
+def issue(file_name, record_id, check, severity, message, **extra):
+    return {'file': file_name, 'id': record_id, 'category': 'integrity',
+            'check': check, 'severity': severity, 'message': message, **extra}
+
+
+def check_integrity(index):
+    """Turn the filled index into integrity issues"""
+    issues = []
+    topics = index.ids['grammar_topic']
+
+    for namespace, record_id, file_name, first in index.collisions:
+        issues.append(issue(file_name, record_id, 'duplicate_id', 'high',
+                            f'{namespace} id already used in {first}'))
+
+    for word, pos, file_name, record_id, first_file, first_id in index.word_collisions:
+        issues.append(issue(file_name, record_id, 'duplicate_word', 'low',
+                            f"'{word}' ({pos or 'no pos'}) duplicates {first_id} in {first_file}"))
+
+    for pack_id in sorted(index.quiz_packs - set(topics), key=str):
+        issues.append(issue('quiz', pack_id, 'dangling_pack', 'high',
+                            f'Quiz packId {pack_id} has no grammar topic'))
+
+    for pack_id, file_name, record_id, container in index.pack_refs['exam_question']:
+        if pack_id not in index.exam_packs and pack_id not in topics:
+            issues.append(issue(file_name, record_id, 'dangling_pack', 'high',
+                                f'packId {pack_id} matches no exam pack or grammar topic'))
+        elif container is not None and pack_id != container:
+            issues.append(issue(file_name, record_id, 'pack_mismatch', 'medium',
+                                f'packId {pack_id} but stored in {container}'))
+
+    for topic_id, file_name in topics.items():
+        if topic_id not in index.quiz_packs:
+            issues.append(issue(file_name, topic_id, 'orphan_topic', 'low',
+                                'Grammar topic has no quiz bank questions'))
+
+    for pack_id, (file_name, declared) in index.exam_packs.items():
+        actual = index.pack_sizes.get(pack_id, 0)
+        if actual == 0:
+            issues.append(issue(file_name, pack_id, 'empty_pack', 'high', 'Exam pack has no questions'))
+        elif declared is not None and declared != actual:
+            issues.append(issue(file_name, pack_id, 'question_count', 'medium',
+                                f'numQuestions is {declared} but the pack has {actual}'))
+
+    return issues
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check ids and references across all content files")
+    parser.add_argument('--report', type=Path, default=REPORT_PATH,
+                        help='where to write the report')
+    args = parser.parse_args()
+
+    print("="*80)
+    print("CROSS-ASSET INTEGRITY CHECK")
+    print("="*80)
+
+    files = find_content_files()
+    index = ContentIndex()
+    for path in files:
+        index.add_file(Path(path).name, json_codec.load(path))
+
+    issues = check_integrity(index)
+    summary = summarize(issues, len(files))
+
+    print(f"Files: {len(files)}, ids: {sum(len(ids) for ids in index.ids.values()):,}, "
+          f"words: {len(index.words):,}")
+    print(f"Issues found: {summary['total_issues']}")
+    for check, count in sorted(summary['by_check'].items(), key=lambda x: -x[1]):
+        print(f"  {check}: {count}")
+        for item in [i for i in issues if i['check'] == check][:3]:
+            print(f"    - {item['file']} {item['id']}: {item['message']}")
+
+    json_codec.dump_pretty({'summary': summary, 'issues': issues}, args.report)
+
+    print(f"\n📄 Report saved to: {args.report.name}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Streaming issue sink for the validators' --jsonl mode
+Issues are appended to a JSONL file (one compact JSON object per line) as
+they are found instead of being collected into one big report. The sink
+keeps running counts per severity, type, file and rule, plus the first few
+records of each for console examples, and writes a small summary file when
+it is closed. Memory stays bounded however many issues a run produces.
+"""
+import os
+from collections import defaultdict
+from pathlib import Path
+
+import json_codec
+
+COUNT_FIELDS = ('severity', 'type', 'file', 'rule')
+MAX_EXAMPLES = 5
+
+
+def summary_path_for(path):
+    """issues.jsonl -> issues.summary.json"""
+    path = Path(path)
+    return path.with_name(path.stem + '.summary.json')
+
+
+class IssueSink:
+    """Appends issue records to a JSONL file and counts them as they go by
+
+    The JSONL file is written under a temporary name and moved into place on
+    close(), so an interrupted run never leaves a truncated issue log behind.
+    """
+
+    def __init__(self, path, count_fields=COUNT_FIELDS, max_examples=MAX_EXAMPLES):
+        self.path = Path(path)
+        self.summary_path = summary_path_for(self.path)
+        self.count_fields = tuple(count_fields)
+        self.max_examples = max_examples
+        self.total = 0
+        self.counts = {field: defaultdict(int) for field in self.count_fields}
+        self._examples = {field: defaultdict(list) for field in self.count_fields}
+        self._tmp_path = self.path.with_name(self.path.name + '.tmp')
+        self._file = open(self._tmp_path, 'w', encoding='utf-8')
+
+    def add(self, record):
+        """Write one issue record and update the counters"""
+        self._file.write(json_codec.dumps_compact(record))
+        self._file.write('\n')
+        self.total += 1
+        for field in self.count_fields:
+            value = record.get(field)
+            if value is None:
+                continue
+            self.counts[field][value] += 1
+            examples = self._examples[field][value]
+            if len(examples) < self.max_examples:
+                examples.append(record)
+
+    def extend(self, records):
+        for record in records:
+            self.add(record)
+
+    def examples(self, field, value):
+        """The first records seen with record[field] == value"""
+        return self._examples[field].get(value, [])
+
+    def summary(self):
+        return {
+            'total_issues': self.total,
+            'issues_file': self.path.name,
+            **{f'by_{field}': dict(sorted(counts.items(), key=lambda x: -x[1]))
+               for field, counts in self.counts.items()},
+        }
+
+    def close(self, **extra):
+        """Finish the JSONL file and write the summary, return the summary dict"""
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+        summary = {**extra, **self.summary()}
+        json_codec.dump_pretty(summary, self.summary_path)
+        return summary
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            if not self._file.closed:
+                self.close()
+            return
+        # Leave any previous complete log in place
+        self._file.close()
+        if self._tmp_path.exists():
+            os.remove(self._tmp_path)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared JSON codec for the content scripts
+Every script loads and writes JSON through here. When orjson is installed it
+does the work; otherwise the stdlib json module does. Output is byte-for-byte
+what the scripts always wrote:
+
+    dumps_pretty(obj)   == json.dumps(obj, ensure_ascii=False, indent=2)
+    dumps_compact(obj)  == json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+orjson formats floats differently (1e16 vs 1e+16) and rejects non-string keys,
+integers wider than 64 bits and lone surrogates, so any value containing a
+float, or that orjson refuses, goes through the stdlib instead.
+
+Files are written to a temp file and moved into place with os.replace.
+"""
+import difflib
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+BACKEND = "orjson" if orjson else "json"
+
+# orjson reads integers wider than 64 bits as floats; leave those to the
+# stdlib. Mapping digits to "0" and everything else to " " turns the check
+# into one C-level substring search.
+_DIGIT_TABLE = bytes(0x30 if 0x30 <= i <= 0x39 else 0x20 for i in range(256))
+_LONG_INTEGER = b"0" * 19
+
+
+def _has_float(obj):
+    """True if any value inside obj is a float"""
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            value = value.values()
+        elif not isinstance(value, (list, tuple)):
+            if isinstance(value, float):
+                return True
+            continue
+        for item in value:
+            if type(item) is str:
+                continue
+            if isinstance(item, (dict, list, tuple)):
+                stack.append(item)
+            elif isinstance(item, float):
+                return True
+    return False
+
+
+def _orjson_dumps(obj, option):
+    """orjson output as str, or None when the stdlib must handle obj"""
+    if orjson is None or _has_float(obj):
+        return None
+    try:
+        return orjson.dumps(obj, option=option).decode("utf-8")
+    except (TypeError, orjson.JSONEncodeError):
+        return None
+
+
+def loads(raw):
+    """Parse JSON from str or bytes
+
+    Input orjson rejects or reads differently (NaN, huge integers) and
+    genuinely broken JSON go to the stdlib, so results and error messages
+    match the json module.
+    """
+    if orjson is not None:
+        data = raw.encode("utf-8", "surrogatepass") if isinstance(raw, str) else raw
+        if _LONG_INTEGER not in data.translate(_DIGIT_TABLE):
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+    if isinstance(raw, (bytes, bytearray)):
+        raw = raw.decode("utf-8")
+    return json.loads(raw)
+
+
+def load(path):
+    """Parse a UTF-8 JSON file"""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def dumps_pretty(obj, sort_keys=False):
+    """json.dumps(obj, ensure_ascii=False, indent=2[, sort_keys=True])"""
+    if orjson is not None:
+        text = _orjson_dumps(obj, orjson.OPT_INDENT_2 | (orjson.OPT_SORT_KEYS if sort_keys else 0))
+        if text is not None:
+            return text
+    return json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=sort_keys)
+
+
+def dumps_compact(obj, sort_keys=False):
+    """json.dumps(obj, ensure_ascii=False, separators=(",", ":")[, sort_keys=True])"""
+    if orjson is not None:
+        text = _orjson_dumps(obj, orjson.OPT_SORT_KEYS if sort_keys else 0)
+        if text is not None:
+            return text
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys)
+
+
+def write_atomic(text, path):
+    """Write text via a temp file and os.replace, so an interrupted run never
+    leaves a half-written file behind"""
+    tmp_path = f"{os.fspath(path)}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def dump_pretty(obj, path, sort_keys=False):
+    """Write obj to a file the way json.dump(..., ensure_ascii=False, indent=2) does"""
+    write_atomic(dumps_pretty(obj, sort_keys), path)
+
+
+def dump_compact(obj, path, sort_keys=False):
+    """Write obj to a file as minified JSON"""
+    write_atomic(dumps_compact(obj, sort_keys), path)
+
+
+def diff_pretty(obj, path, sort_keys=False):
+    """Unified diff lines from the file at path to obj written by dump_pretty"""
+    with open(path, "r", encoding="utf-8") as f:
+        before = f.read()
+    name = os.path.basename(path)
+    return difflib.unified_diff(before.splitlines(keepends=True),
+                                dumps_pretty(obj, sort_keys).splitlines(keepends=True),
+                                f"a/{name}", f"b/{name}")
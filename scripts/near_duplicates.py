@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Near-duplicate question finder
+Shingles each question's stem and choice set, builds MinHash signatures and
+buckets them with locality-sensitive hashing, then clusters questions whose
+Jaccard similarity is above a threshold. Cost grows with the number of
+questions, not with the number of pairs.
+"""
+import argparse
+import hashlib
+import random
+import re
+from collections import defaultdict
+from pathlib import Path
+
+import json_codec
+
+QUIZ_DIR = Path(__file__).parent.parent / "assets" / "data" / "quiz"
+REPORT_PATH = Path(__file__).parent / "near_duplicates_report.json"
+
+MERSENNE_PRIME = (1 << 61) - 1
+TOKEN_RE = re.compile(r"_+|[a-z0-9']+")
+
+# Subject pronouns that take the same verb form are interchangeable: "He _____
+# English every weekend." and "She _____ English every weekend." test the same thing
+SUBJECT_TOKENS = {
+    'he': '<he/she/it>', 'she': '<he/she/it>', 'it': '<he/she/it>',
+    'we': '<we/they>', 'they': '<we/they>',
+}
+
+
+def normalize_token(token):
+    """Collapse blanks to '_' and subject pronouns to their agreement class"""
+    if token.startswith('_'):
+        return '_'
+    return SUBJECT_TOKENS.get(token, token)
+
+
+def shingles(question, size=2, include_choices=True):
+    """Word n-gram shingles of the stem, plus one shingle per choice"""
+    tokens = [normalize_token(t) for t in TOKEN_RE.findall(question.get('stem', '').lower())]
+    result = {' '.join(tokens[i:i + size]) for i in range(max(len(tokens) - size + 1, 1))}
+    if include_choices:
+        result.update(f"choice:{str(c).lower()}" for c in question.get('choices', []))
+    return frozenset(result)
+
+
+def jaccard(a, b):
+    """Jaccard similarity of two sets"""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def lsh_params(threshold, num_perm):
+    """Pick (bands, rows) with bands * rows == num_perm whose S-curve knee is nearest threshold"""
+    options = [(b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0]
+    return min(options, key=lambda br: abs((1 / br[0]) ** (1 / br[1]) - threshold))
+
+
+class MinHasher:
+    """MinHash signatures with per-shingle caching
+
+    The generated bank draws from small word lists, so the same shingles
+    recur across thousands of questions; each shingle is hashed under all
+    permutations only once.
+    """
+
+    def __init__(self, num_perm=64, seed=1):
+        rng = random.Random(seed)
+        self.perms = [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+                      for _ in range(num_perm)]
+        self._cache = {}
+
+    def _hashes(self, shingle):
+        cached = self._cache.get(shingle)
+        if cached is None:
+            base = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+            cached = tuple((a * base + b) % MERSENNE_PRIME for a, b in self.perms)
+            self._cache[shingle] = cached
+        return cached
+
+    def signature(self, shingle_set):
+        """Elementwise minimum of the shingles' permuted hashes"""
+        if not shingle_set:
+            return (MERSENNE_PRIME,) * len(self.perms)
+        return tuple(map(min, zip(*(self._hashes(s) for s in shingle_set))))
+
+
+class UnionFind:
+    """Disjoint sets over 0..size-1, smallest index as root"""
+
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def find_near_duplicates(questions, threshold=0.8, num_perm=64, shingle_size=2, include_choices=True):
+    """Cluster questions whose shingle sets have Jaccard similarity >= threshold
+
+    Returns a list of clusters (lists of indexes into questions), largest first.
+    Questions with identical shingle sets are grouped directly; only distinct
+    sets go through MinHash/LSH. Inside an LSH bucket each member is compared
+    with the bucket's first member and its predecessor only, which keeps huge
+    buckets linear at the cost of a little recall.
+    """
+    # Collapse identical shingle sets first
+    groups = defaultdict(list)
+    for idx, q in enumerate(questions):
+        groups[shingles(q, shingle_size, include_choices)].append(idx)
+    unique_sets = list(groups)
+
+    bands, rows = lsh_params(threshold, num_perm)
+    hasher = MinHasher(bands * rows)
+    uf = UnionFind(len(unique_sets))
+
+    buckets = defaultdict(list)
+    for set_idx, shingle_set in enumerate(unique_sets):
+        sig = hasher.signature(shingle_set)
+        for band in range(bands):
+            buckets[(band, sig[band * rows:(band + 1) * rows])].append(set_idx)
+
+    for members in buckets.values():
+        first = members[0]
+        for prev, other in zip(members, members[1:]):
+            for candidate in {first, prev}:
+                if (uf.find(other) != uf.find(candidate)
+                        and jaccard(unique_sets[candidate], unique_sets[other]) >= threshold):
+                    uf.union(candidate, other)
+
+    clusters = defaultdict(list)
+    for set_idx, shingle_set in enumerate(unique_sets):
+        clusters[uf.find(set_idx)].extend(groups[shingle_set])
+
+    result = [sorted(members) for members in clusters.values() if len(members) > 1]
+    result.sort(key=lambda members: (-len(members), members[0]))
+    return result
+
+
+def load_questions(files):
+    """Load every question from quiz files, tagged with its file and difficulty"""
+    questions = []
+    for path in files:
+        data = json_codec.load(path)
+        for difficulty in ['easy', 'medium', 'hard']:
+            for q in data.get(difficulty, []):
+                questions.append({**q, '_file': Path(path).name, '_difficulty': difficulty})
+    return questions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find near-duplicate quiz questions with MinHash/LSH")
+    parser.add_argument('files', nargs='*', type=Path,
+                        help='quiz files to scan (default: all grammar quiz files)')
+    parser.add_argument('--threshold', type=float, default=0.8,
+                        help='minimum Jaccard similarity to cluster two questions (default: 0.8)')
+    parser.add_argument('--num-perm', type=int, default=64,
+                        help='MinHash permutations (default: 64)')
+    parser.add_argument('--shingle-size', type=int, default=2,
+                        help='words per stem shingle (default: 2)')
+    parser.add_argument('--stems-only', action='store_true',
+                        help='ignore the choice set when comparing questions')
+    parser.add_argument('--report', type=Path, default=REPORT_PATH,
+                        help='where to write the cluster report')
+    args = parser.parse_args()
+
+    files = args.files or sorted(QUIZ_DIR.glob('grammar_quiz_*.json'))
+    questions = load_questions(files)
+
+    print("="*80)
+    print("NEAR-DUPLICATE QUESTION SCAN")
+    print("="*80)
+    print(f"Questions: {len(questions):,}, threshold: {args.threshold}")
+
+    clusters = find_near_duplicates(questions, args.threshold, args.num_perm,
+                                    args.shingle_size, not args.stems_only)
+
+    clustered = sum(len(c) for c in clusters)
+    redundant_ids = [questions[idx].get('id') for members in clusters for idx in members[1:]]
+    print(f"Clusters: {len(clusters):,} covering {clustered:,} questions")
+    print(f"Redundant (all but one per cluster): {len(redundant_ids):,}")
+
+    for members in clusters[:5]:
+        print(f"\n  {len(members)} questions, e.g.:")
+        for idx in members[:3]:
+            print(f"    - {questions[idx].get('id')}: {questions[idx].get('stem', '')[:70]}")
+
+    report = {
+        'summary': {
+            'questions': len(questions),
+            'threshold': args.threshold,
+            'clusters': len(clusters),
+            'clustered_questions': clustered,
+            'redundant': len(redundant_ids),
+        },
+        'clusters': [
+            [{'id': questions[idx].get('id'), 'file': questions[idx]['_file'], 'stem': questions[idx].get('stem')}
+             for idx in members]
+            for members in clusters
+        ],
+        'redundant_ids': redundant_ids,
+    }
+    json_codec.dump_pretty(report, args.report)
+
+    print(f"\n📄 Cluster report saved to: {args.report}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dictionary-encoded quiz export
+Rewrites a grammar quiz file so repeated values are stored once in per-file
+tables and questions refer to them by integer id. The result is still JSON,
+so the app can parse it directly, and decode_quiz() restores the original
+structure exactly.
+
+Encoded layout:
+    {
+      "format": "dict-v1",
+      "tables": {
+        "stemHeads": [...],     text before the first blank (the subject phrase)
+        "stemTails": [...],     text after the first blank
+        "choices": [...],
+        "explanations": [...],
+        "values": [...]         skillType / packId values
+      },
+      "easy": [[head, tail, [choice ids], correctIndex, explanation,
+                skillType, packId, id], ...],
+      ...
+    }
+
+tail is -1 for stems without a blank. id is null when it is the default
+q_<packId>_<d>_<n> id for its position.
+"""
+import argparse
+import gzip
+from pathlib import Path
+
+import json_codec
+
+QUIZ_DIR = Path(__file__).parent.parent / "assets" / "data" / "quiz"
+
+FORMAT = "dict-v1"
+BLANK = "_____"
+TABLES = ["stemHeads", "stemTails", "choices", "explanations", "values"]
+QUESTION_KEYS = ["stem", "choices", "correctIndex", "explanation", "id", "skillType", "packId"]
+
+
+def default_id(pack_id, difficulty, index):
+    """Id the generator assigns to a question at a 0-based position"""
+    return f"q_{pack_id}_{difficulty[0]}_{index + 1}"
+
+
+class _Tables:
+    def __init__(self):
+        self.tables = {name: [] for name in TABLES}
+        self._ids = {name: {} for name in TABLES}
+
+    def ref(self, table, value):
+        ids = self._ids[table]
+        if value not in ids:
+            ids[value] = len(self.tables[table])
+            self.tables[table].append(value)
+        return ids[value]
+
+
+def encode_quiz(data):
+    """Dictionary-encode a {"easy": [...], ...} quiz structure"""
+    tables = _Tables()
+    encoded = {"format": FORMAT, "tables": tables.tables}
+
+    for difficulty, questions in data.items():
+        rows = []
+        for index, q in enumerate(questions):
+            unknown = set(q) - set(QUESTION_KEYS)
+            missing = set(QUESTION_KEYS) - set(q)
+            if unknown or missing:
+                raise ValueError(f"{q.get('id')}: unsupported fields {sorted(unknown)}, missing {sorted(missing)}")
+
+            head, blank, tail = q["stem"].partition(BLANK)
+            question_id = q["id"]
+            rows.append([
+                tables.ref("stemHeads", head),
+                tables.ref("stemTails", tail) if blank else -1,
+                [tables.ref("choices", c) for c in q["choices"]],
+                q["correctIndex"],
+                tables.ref("explanations", q["explanation"]),
+                tables.ref("values", q["skillType"]),
+                tables.ref("values", q["packId"]),
+                None if question_id == default_id(q["packId"], difficulty, index) else question_id,
+            ])
+        encoded[difficulty] = rows
+
+    return encoded
+
+
+def decode_quiz(encoded):
+    """Restore the original quiz structure from its dictionary encoding"""
+    if encoded.get("format") != FORMAT:
+        raise ValueError(f"Unsupported quiz encoding: {encoded.get('format')}")
+    tables = encoded["tables"]
+    heads, tails = tables["stemHeads"], tables["stemTails"]
+    choices, explanations, values = tables["choices"], tables["explanations"], tables["values"]
+
+    data = {}
+    for difficulty, rows in encoded.items():
+        if difficulty in ("format", "tables"):
+            continue
+        questions = []
+        for index, (head, tail, choice_ids, correct_index, explanation, skill_type, pack_id, question_id) \
+                in enumerate(rows):
+            pack = values[pack_id]
+            questions.append({
+                "stem": heads[head] if tail < 0 else heads[head] + BLANK + tails[tail],
+                "choices": [choices[c] for c in choice_ids],
+                "correctIndex": correct_index,
+                "explanation": explanations[explanation],
+                "id": question_id if question_id is not None else default_id(pack, difficulty, index),
+                "skillType": values[skill_type],
+                "packId": pack,
+            })
+        data[difficulty] = questions
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export dictionary-encoded grammar quiz files")
+    parser.add_argument("out_dir", type=Path, help="directory to write the .dict.json files to")
+    parser.add_argument("files", nargs="*", type=Path,
+                        help="quiz files to encode (default: all grammar quiz files)")
+    parser.add_argument("--verify", action="store_true",
+                        help="decode every output and compare it with its source")
+    args = parser.parse_args()
+
+    files = args.files or sorted(QUIZ_DIR.glob("grammar_quiz_*.json"))
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+
+    failed = 0
+    for path in files:
+        data = json_codec.load(path)
+        encoded = encode_quiz(data)
+        raw = json_codec.dumps_compact(encoded).encode("utf-8")
+        out_path = args.out_dir / (path.stem + ".dict.json")
+        out_path.write_bytes(raw)
+
+        line = (f"{path.name}: {path.stat().st_size:,} → {len(raw):,} bytes "
+                f"(gzip {len(gzip.compress(raw, mtime=0)):,}), "
+                + ", ".join(f"{name} {len(encoded['tables'][name]):,}" for name in TABLES))
+        if args.verify:
+            ok = decode_quiz(json_codec.loads(raw)) == data
+            failed += not ok
+            line += " ✅" if ok else " ❌ round trip mismatch"
+        print(line)
+
+    if failed:
+        raise SystemExit(f"{failed} file(s) failed the round trip check")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compact export of quiz assets
+Writes minified JSON plus pre-compressed .json.gz (and .json.br when the
+brotli module is installed) companions, and reports size and parse-time
+savings per file.
+"""
+import argparse
+import gzip
+import json
+import time
+from pathlib import Path
+
+import json_codec
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+QUIZ_DIR = Path(__file__).parent.parent / "assets" / "data" / "quiz"
+
+
+def minify_json(data) -> bytes:
+    """Serialize data without any whitespace"""
+    return json_codec.dumps_compact(data).encode("utf-8")
+
+
+def time_parse(raw: bytes, repeat: int = 3) -> float:
+    """Best-of-N json.loads time in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        json.loads(raw)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def export_compact(src: Path, export_dir: Path) -> dict:
+    """Export one JSON file as minified + compressed companions, return its stats"""
+    raw = src.read_bytes()
+    minified = minify_json(json_codec.loads(raw))
+
+    export_dir.mkdir(parents=True, exist_ok=True)
+    out = export_dir / src.name
+    out.write_bytes(minified)
+
+    # mtime=0 keeps the .gz bytes reproducible across runs
+    gz = gzip.compress(minified, compresslevel=9, mtime=0)
+    out.with_name(out.name + ".gz").write_bytes(gz)
+
+    stats = {
+        "file": src.name,
+        "pretty_bytes": len(raw),
+        "minified_bytes": len(minified),
+        "gzip_bytes": len(gz),
+        "pretty_parse_ms": round(time_parse(raw), 2),
+        "minified_parse_ms": round(time_parse(minified), 2),
+    }
+
+    if brotli is not None:
+        br = brotli.compress(minified, quality=11)
+        out.with_name(out.name + ".br").write_bytes(br)
+        stats["brotli_bytes"] = len(br)
+
+    return stats
+
+
+def export_all(files, export_dir: Path, root: Path = None) -> list:
+    """Export every file and print a per-file savings table
+    
+    With root, each file keeps its directory relative to root under
+    export_dir (shard directories), otherwise all files land in export_dir.
+    """
+    export_dir = Path(export_dir)
+    results = []
+
+    print(f"\n{'='*80}")
+    print(f"COMPACT EXPORT → {export_dir}")
+    print(f"{'='*80}")
+
+    for src in files:
+        src = Path(src)
+        if root is None:
+            stats = export_compact(src, export_dir)
+        else:
+            stats = export_compact(src, export_dir / src.parent.relative_to(root))
+            stats["file"] = src.relative_to(root).as_posix()
+        results.append(stats)
+        saved = 1 - stats["minified_bytes"] / stats["pretty_bytes"]
+        print(f"{stats['file']}: {stats['pretty_bytes']:,} → {stats['minified_bytes']:,} bytes "
+              f"(-{saved:.0%}), gzip {stats['gzip_bytes']:,}"
+              + (f", brotli {stats['brotli_bytes']:,}" if "brotli_bytes" in stats else "")
+              + f" | parse {stats['pretty_parse_ms']:.1f} → {stats['minified_parse_ms']:.1f} ms")
+
+    if results:
+        pretty = sum(r["pretty_bytes"] for r in results)
+        minified = sum(r["minified_bytes"] for r in results)
+        gz = sum(r["gzip_bytes"] for r in results)
+        print(f"\nTotal: {pretty:,} → {minified:,} bytes minified, {gz:,} bytes gzip")
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export minified and compressed quiz assets")
+    parser.add_argument("export_dir", type=Path, help="directory to write the compact files to")
+    parser.add_argument("files", nargs="*", type=Path,
+                        help="JSON files to export (default: all grammar quiz files)")
+    args = parser.parse_args()
+
+    files = args.files or sorted(QUIZ_DIR.glob("grammar_quiz_*.json"))
+    export_all(files, args.export_dir)
+
+
+if __name__ == "__main__":
+    main()
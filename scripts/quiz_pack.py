@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Packed binary quiz bank
+Writes a grammar quiz file as a binary bank with fixed-width records and an
+interned string table, so a reader can mmap it and fetch question N of a
+difficulty without parsing the rest of the file.
+
+Layout (all integers little-endian):
+    header     magic "EPQB", version u16, section count u16,
+               string count u32, string table offset u32, records offset u32
+    sections   per difficulty: name (8 bytes, NUL padded), first record u32,
+               record count u32
+    strings    (string count + 1) u32 offsets into the blob, then the UTF-8 blob
+    records    fixed-width: id, stem, 4 choices, explanation, skillType and
+               packId as u32 string ids (NO_STRING when absent), correctIndex i8
+"""
+import argparse
+import mmap
+import struct
+from pathlib import Path
+
+import json_codec
+
+QUIZ_DIR = Path(__file__).parent.parent / "assets" / "data" / "quiz"
+
+MAGIC = b"EPQB"
+VERSION = 1
+NO_STRING = 0xFFFFFFFF
+NUM_CHOICES = 4
+
+HEADER = struct.Struct("<4sHHIII")
+SECTION = struct.Struct("<8sII")
+OFFSET = struct.Struct("<I")
+RECORD = struct.Struct("<9Ib3x")
+
+# JSON key order of a generated question
+QUESTION_KEYS = ["stem", "choices", "correctIndex", "explanation", "id", "skillType", "packId"]
+
+
+class StringTable:
+    """Interns strings to dense integer ids"""
+
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+
+    def intern(self, value):
+        if value is None:
+            return NO_STRING
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+
+
+def pack_question(q, strings):
+    """Encode one question as a fixed-width record"""
+    unknown = set(q) - set(QUESTION_KEYS)
+    if unknown:
+        raise ValueError(f"{q.get('id')}: fields not supported by the packed format: {sorted(unknown)}")
+    choices = q.get("choices", [])
+    if len(choices) > NUM_CHOICES:
+        raise ValueError(f"{q.get('id')}: more than {NUM_CHOICES} choices")
+    choice_ids = [strings.intern(c) for c in choices] + [NO_STRING] * (NUM_CHOICES - len(choices))
+    return RECORD.pack(
+        strings.intern(q.get("id")),
+        strings.intern(q.get("stem")),
+        *choice_ids,
+        strings.intern(q.get("explanation")),
+        strings.intern(q.get("skillType")),
+        strings.intern(q.get("packId")),
+        q.get("correctIndex", -1),
+    )
+
+
+def pack_quiz(data, out_path):
+    """Write a {"easy": [...], ...} quiz structure as a packed bank"""
+    strings = StringTable()
+    sections = []
+    records = []
+    for difficulty, questions in data.items():
+        if len(difficulty.encode("ascii")) > 8:
+            raise ValueError(f"Section name too long for the packed format: {difficulty}")
+        sections.append((difficulty, len(records), len(questions)))
+        records.extend(pack_question(q, strings) for q in questions)
+
+    blob = bytearray()
+    offsets = [0]
+    for value in strings.strings:
+        blob += value.encode("utf-8")
+        offsets.append(len(blob))
+
+    strings_offset = HEADER.size + SECTION.size * len(sections)
+    records_offset = strings_offset + OFFSET.size * len(offsets) + len(blob)
+    # Keep records 4-byte aligned
+    padding = -records_offset % 4
+    records_offset += padding
+
+    with open(out_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(sections), len(strings.strings), strings_offset, records_offset))
+        for difficulty, first, count in sections:
+            f.write(SECTION.pack(difficulty.encode("ascii"), first, count))
+        f.write(b"".join(OFFSET.pack(o) for o in offsets))
+        f.write(blob)
+        f.write(b"\0" * padding)
+        f.write(b"".join(records))
+
+    return {"questions": len(records), "strings": len(strings.strings)}
+
+
+class PackedQuizBank:
+    """mmap-backed reader for a packed quiz bank"""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, section_count, self._string_count, self._strings_offset, self._records_offset = \
+            HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a version {VERSION} packed quiz bank")
+
+        self.sections = {}
+        for i in range(section_count):
+            name, first, count = SECTION.unpack_from(self._map, HEADER.size + i * SECTION.size)
+            self.sections[name.rstrip(b"\0").decode("ascii")] = (first, count)
+        self._blob_offset = self._strings_offset + OFFSET.size * (self._string_count + 1)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def count(self, difficulty):
+        """Number of questions in a difficulty"""
+        return self.sections[difficulty][1]
+
+    def string(self, string_id):
+        """Decode one interned string"""
+        if string_id == NO_STRING:
+            return None
+        start, end = struct.unpack_from("<II", self._map, self._strings_offset + OFFSET.size * string_id)
+        return self._map[self._blob_offset + start:self._blob_offset + end].decode("utf-8")
+
+    def question(self, difficulty, n):
+        """Question n (0-based) of a difficulty, touching only its record and strings"""
+        first, count = self.sections[difficulty]
+        if not 0 <= n < count:
+            raise IndexError(f"{difficulty} has {count} questions, asked for {n}")
+        fields = RECORD.unpack_from(self._map, self._records_offset + (first + n) * RECORD.size)
+        question_id, stem, *choice_ids, explanation, skill_type, pack_id, correct_index = fields
+        q = {
+            "stem": self.string(stem),
+            "choices": [self.string(c) for c in choice_ids if c != NO_STRING],
+            "correctIndex": correct_index,
+            "explanation": self.string(explanation),
+            "id": self.string(question_id),
+            "skillType": self.string(skill_type),
+            "packId": self.string(pack_id),
+        }
+        return {k: v for k, v in q.items() if v is not None and (k != "correctIndex" or v >= 0)}
+
+    def iter_questions(self, difficulty):
+        """All questions of a difficulty in order"""
+        for n in range(self.count(difficulty)):
+            yield self.question(difficulty, n)
+
+
+def verify_round_trip(data, bank_path):
+    """Check that every question reads back exactly as in the JSON"""
+    with PackedQuizBank(bank_path) as bank:
+        if list(bank.sections) != list(data):
+            return False
+        for difficulty, questions in data.items():
+            if bank.count(difficulty) != len(questions):
+                return False
+            for n, q in enumerate(questions):
+                if bank.question(difficulty, n) != q:
+                    print(f"  Mismatch at {difficulty}[{n}]: {q.get('id')}")
+                    return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export grammar quiz files as packed binary banks")
+    parser.add_argument("out_dir", type=Path, help="directory to write the .bin banks to")
+    parser.add_argument("files", nargs="*", type=Path,
+                        help="quiz files to pack (default: all grammar quiz files)")
+    parser.add_argument("--verify", action="store_true",
+                        help="read every bank back and compare it with its JSON")
+    args = parser.parse_args()
+
+    files = args.files or sorted(QUIZ_DIR.glob("grammar_quiz_*.json"))
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+
+    failed = 0
+    for path in files:
+        data = json_codec.load(path)
+        out_path = args.out_dir / (path.stem + ".bin")
+        stats = pack_quiz(data, out_path)
+        line = (f"{path.name}: {stats['questions']:,} questions, {stats['strings']:,} strings, "
+                f"{path.stat().st_size:,} → {out_path.stat().st_size:,} bytes")
+        if args.verify:
+            ok = verify_round_trip(data, out_path)
+            failed += not ok
+            line += " ✅" if ok else " ❌ round trip mismatch"
+        print(line)
+
+    if failed:
+        raise SystemExit(f"{failed} file(s) failed the round trip check")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Streaming reader for grammar quiz files
+Yields (difficulty, question) pairs one at a time from the top-level
+"easy"/"medium"/"hard" arrays, decoding each question with the C JSON
+scanner as soon as its bytes have been read. Memory use is bounded by the
+read chunk plus one question, however large the file is.
+"""
+import json
+import re
+from pathlib import Path
+
+DIFFICULTIES = ('easy', 'medium', 'hard')
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class QuizStreamError(ValueError):
+    """The file is not a JSON object of question arrays"""
+
+
+class _Reader:
+    """Character buffer over a text file that refills on demand"""
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Append the next chunk, dropping what has been consumed; False at EOF"""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character without consuming it ('' at EOF)"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise QuizStreamError(f"Expected one of {chars!r}, found {char or 'end of file'!r}")
+        self.pos += 1
+        return char
+
+    def value(self, decoder):
+        """Decode the next complete JSON value, reading more input as needed"""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Most likely the value runs past the end of the buffer
+                if self.fill():
+                    continue
+                raise
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and not self.eof and not isinstance(value, (dict, list, str)):
+                if self.fill():
+                    continue
+            self.pos = end
+            return value
+
+
+def iter_quiz_questions(path, difficulties=DIFFICULTIES, chunk_size=CHUNK_SIZE):
+    """Yield (difficulty, question) from a quiz file without loading it whole
+
+    Arrays under other keys and non-array values are decoded and skipped.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _Reader(f, chunk_size)
+        reader.expect('{')
+        if reader.peek() == '}':
+            return
+        while True:
+            key = reader.value(decoder)
+            if not isinstance(key, str):
+                raise QuizStreamError(f"{path}: object key expected, found {key!r}")
+            reader.expect(':')
+
+            if reader.peek() == '[' and key in difficulties:
+                reader.expect('[')
+                if reader.peek() == ']':
+                    reader.pos += 1
+                else:
+                    while True:
+                        yield key, reader.value(decoder)
+                        if reader.expect(',]') == ']':
+                            break
+            else:
+                reader.value(decoder)
+
+            if reader.expect(',}') == '}':
+                return
+
+
+def iter_quiz_files(files, difficulties=DIFFICULTIES):
+    """Yield (file name, difficulty, question) across several quiz files"""
+    for path in files:
+        name = Path(path).name
+        for difficulty, question in iter_quiz_questions(path, difficulties):
+            yield name, difficulty, question
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Full-text search index over app content
+Tokenizes vocab words and examples, quiz/exam/reading question stems and
+choices, and passage content into an inverted index, so "where is 'abandon'
+used" is a few dict lookups instead of a grep over every asset.
+
+Index layout (minified JSON):
+    {
+      "format": "search-index-v1",
+      "fields": ["word", "example", "stem", "choices", "content"],
+      "docs": [[file, id, kind], ...],
+      "postings": {"abandon": [gap, mask, gap, mask, ...], ...}
+    }
+
+Each postings list holds sorted doc numbers as gaps from the previous doc,
+each followed by a bitmask of the fields the term occurs in.
+
+Usage:
+    python search_index.py --build
+    python search_index.py abandon
+    python search_index.py "give up" --field stem
+    python search_index.py aband* --limit 50
+"""
+import argparse
+import bisect
+import re
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from content_validation import find_content_files, iter_records
+import json_codec
+
+INDEX_PATH = Path(__file__).parent / "search_index.json"
+
+FORMAT = "search-index-v1"
+FIELDS = ["word", "example", "stem", "choices", "content"]
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+def tokenize(text):
+    """Lowercased word tokens, keeping contractions like don't together"""
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+def record_fields(kind, record):
+    """(field, text) pairs to index for one record"""
+    if kind == 'vocab_item':
+        yield 'word', record.get('word')
+        yield 'example', record.get('example') or record.get('exampleEn')
+    elif kind == 'passage':
+        yield 'content', record.get('content')
+    elif kind in ('quiz_question', 'exam_question', 'reading_question'):
+        yield 'stem', record.get('stem')
+        yield 'choices', ' '.join(str(c) for c in record.get('choices', []))
+
+
+def build_index(files):
+    """Build the index dict from asset files"""
+    docs = []
+    masks = defaultdict(dict)  # term -> {doc: field mask}
+
+    for path in files:
+        path = Path(path)
+        data = json_codec.load(path)
+        for kind, record, context in iter_records(path.name, data):
+            doc = len(docs)
+            indexed = False
+            for field, text in record_fields(kind, record):
+                bit = 1 << FIELDS.index(field)
+                for term in tokenize(text):
+                    postings = masks[term]
+                    postings[doc] = postings.get(doc, 0) | bit
+                    indexed = True
+            if indexed:
+                docs.append([context.get('file', path.name), record.get('id'), kind])
+
+    postings = {}
+    for term in sorted(masks):
+        flat = []
+        prev = 0
+        for doc, mask in masks[term].items():  # docs were added in increasing order
+            flat += [doc - prev, mask]
+            prev = doc
+        postings[term] = flat
+
+    return {'format': FORMAT, 'fields': FIELDS, 'docs': docs, 'postings': postings}
+
+
+class SearchIndex:
+    """Query interface over a loaded index"""
+
+    def __init__(self, index):
+        if index.get('format') != FORMAT:
+            raise ValueError(f"Not a {FORMAT} search index")
+        self.fields = index['fields']
+        self.docs = index['docs']
+        self.postings = index['postings']
+        self._terms = sorted(self.postings)
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        return cls(json_codec.load(path))
+
+    def expand(self, term):
+        """Terms matching a query term; a trailing * matches by prefix"""
+        term = term.lower()
+        if not term.endswith('*'):
+            return [term] if term in self.postings else []
+        prefix = term[:-1]
+        start = bisect.bisect_left(self._terms, prefix)
+        end = bisect.bisect_left(self._terms, prefix + '\uffff')
+        return self._terms[start:end]
+
+    def lookup(self, term, fields=None):
+        """{doc: field mask} for one query term, restricted to fields"""
+        wanted = 0
+        for field in fields or self.fields:
+            wanted |= 1 << self.fields.index(field)
+        result = {}
+        for expanded in self.expand(term):
+            flat = self.postings[expanded]
+            doc = 0
+            for i in range(0, len(flat), 2):
+                doc += flat[i]
+                mask = flat[i + 1] & wanted
+                if mask:
+                    result[doc] = result.get(doc, 0) | mask
+        return result
+
+    def search(self, query, fields=None):
+        """Docs containing every term of the query, as (file, id, kind, fields)"""
+        terms = []
+        for word in query.split():
+            tokens = tokenize(word)
+            if tokens and word.endswith('*'):
+                tokens[-1] += '*'
+            terms.extend(tokens)
+        if not terms:
+            return []
+
+        matches = self.lookup(terms[0], fields)
+        for term in terms[1:]:
+            if not matches:
+                break
+            other = self.lookup(term, fields)
+            matches = {doc: mask | other[doc] for doc, mask in matches.items() if doc in other}
+
+        return [(*self.docs[doc], [f for i, f in enumerate(self.fields) if mask & (1 << i)])
+                for doc, mask in sorted(matches.items())]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search app content with an inverted index")
+    parser.add_argument('query', nargs='*',
+                        help='words that must all occur; a trailing * matches by prefix')
+    parser.add_argument('--build', action='store_true',
+                        help='(re)build the index from assets/data first')
+    parser.add_argument('--index', type=Path, default=INDEX_PATH,
+                        help='index file (default: scripts/search_index.json)')
+    parser.add_argument('--field', action='append', choices=FIELDS,
+                        help='only match in this field (repeatable)')
+    parser.add_argument('--limit', type=int, default=20,
+                        help='matches to print (default: 20)')
+    args = parser.parse_args()
+
+    if args.build or not args.index.exists():
+        files = find_content_files()
+        index = build_index(files)
+        json_codec.dump_compact(index, args.index)
+        print(f"Indexed {len(index['docs']):,} records from {len(files)} files, "
+              f"{len(index['postings']):,} terms → {args.index} ({args.index.stat().st_size:,} bytes)")
+
+    if not args.query:
+        return
+
+    start = time.perf_counter()
+    index = SearchIndex.load(args.index)
+    loaded = time.perf_counter()
+    results = index.search(' '.join(args.query), args.field)
+    elapsed = time.perf_counter() - loaded
+
+    print(f"{len(results):,} matches for {' '.join(args.query)!r} "
+          f"(load {(loaded - start) * 1000:.0f} ms, query {elapsed * 1000:.1f} ms)")
+    for file_name, record_id, kind, fields in results[:args.limit]:
+        print(f"  {file_name}  {record_id}  [{kind}: {', '.join(fields)}]")
+    if len(results) > args.limit:
+        print(f"  ... and {len(results) - args.limit:,} more")
+
+
+if __name__ == '__main__':
+    main()
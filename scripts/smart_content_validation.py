@@ -3,11 +3,18 @@
 """
 Smart grammar and translation checker - focusing on real issues
 """
-import json
+import argparse
 import re
 from pathlib import Path
 from collections import defaultdict
 
+from file_pool import add_jobs_argument, imap_files
+from issue_sink import COUNT_FIELDS, IssueSink
+import json_codec
+from text_batch import TextColumn
+from validation_cache import ValidationCache, add_cache_argument, rule_version
+from vocab_store import iter_store_files, load_store
+
 def check_english_grammar(text, context='general'):
     """Check English grammar in text with context awareness"""
     issues = []
@@ -124,66 +131,210 @@ def check_thai_translation(text):
     
     return issues
 
-def check_vocab_file(filepath):
-    """Check a vocabulary file"""
+# ===== COLUMN CHECKS =====
+# Same rules as check_english_grammar / check_thai_translation, applied to a
+# whole column of strings in one regex scan per rule (see text_batch.py)
+
+ENGLISH_BATCH_RULES = [
+    ('spacing', 'Contains double spaces', 'medium', re.compile(r'  ')),
+    ('punctuation', 'No ending punctuation', 'low',
+     re.compile(r'(?<![^\x00])[A-Z][a-z]+[^\x00\n]*[a-z](?![^\x00])')),
+    ('grammar', 'Verb agreement issue: "are is" or "are am"', 'high',
+     re.compile(r'\b(are)\s+(is|am)\b', re.IGNORECASE)),
+    ('grammar', 'Duplicate auxiliary verb', 'high',
+     re.compile(r'\b(have|has)\s+(has|have)\b', re.IGNORECASE)),
+    ('article', 'Should use "an" before vowel', 'medium',
+     re.compile(r'\ba\s+[aeiou]', re.IGNORECASE)),
+]
+
+THAI_BATCH_RULES = [
+    ('missing_thai', 'No Thai characters found - should be Thai translation', 'high',
+     re.compile(r'(?<![^\x00])[^\x00\u0E00-\u0E7F]{4,}(?![^\x00])')),
+    ('placeholder', 'Placeholder "..." instead of actual translation', 'high',
+     re.compile(r'(?<![^\x00])\.\.\.(?![^\x00])')),
+    ('placeholder', 'Empty/placeholder translation', 'high',
+     re.compile(r'(?<![^\x00])[\-\.]+\n?(?![^\x00])')),
+]
+
+def english_grammar_masks(texts, context='general'):
+    """Per-rule 0/1 masks of check_english_grammar over a column of strings"""
+    texts = list(texts)
+    # Only strings check_english_grammar would look at take part in the scan
+    eligible = [i for i, text in enumerate(texts)
+                if isinstance(text, str) and len(text) >= 8 and ' ' in text
+                and not (len(text.split()) == 1 and text.lower().endswith(('ing', 'ed', 'en')))]
+    column = TextColumn(texts[i] for i in eligible)
+    masks = []
+    for issue_type, message, severity, pattern in ENGLISH_BATCH_RULES:
+        mask = bytearray(len(texts))
+        if issue_type != 'punctuation' or context == 'sentence':
+            for pos, hit in enumerate(column.mask(pattern)):
+                if hit and (issue_type != 'punctuation' or len(column.texts[pos]) > 15):
+                    mask[eligible[pos]] = 1
+        masks.append(((issue_type, message, severity), mask))
+    return masks
+
+def thai_translation_masks(texts):
+    """Per-rule 0/1 masks of check_thai_translation over a column of strings"""
+    texts = list(texts)
+    eligible = [i for i, text in enumerate(texts) if isinstance(text, str) and text]
+    column = TextColumn(texts[i] for i in eligible)
+    masks = []
+    for issue_type, message, severity, pattern in THAI_BATCH_RULES:
+        mask = bytearray(len(texts))
+        for pos, hit in enumerate(column.mask(pattern)):
+            if hit:
+                mask[eligible[pos]] = 1
+        masks.append(((issue_type, message, severity), mask))
+    return masks
+
+def issues_from_masks(texts, masks):
+    """Per-item issue lists, in rule order, from rule masks"""
+    issues = [[] for _ in texts]
+    for (issue_type, message, severity), mask in masks:
+        start = mask.find(1)
+        while start != -1:
+            issues[start].append({'type': issue_type, 'message': message,
+                                  'severity': severity, 'text': texts[start]})
+            start = mask.find(1, start + 1)
+    return issues
+
+def check_english_grammar_batch(texts, context='general'):
+    """check_english_grammar for every string of a column"""
+    texts = list(texts)
+    return issues_from_masks(texts, english_grammar_masks(texts, context))
+
+def check_thai_translation_batch(texts):
+    """check_thai_translation for every string of a column"""
+    texts = list(texts)
+    return issues_from_masks(texts, thai_translation_masks(texts))
+
+def check_vocab_item(item):
+    """Issues in one vocabulary item, without its id and file"""
     issues = []
+    translation = item.get('translation', '')
+    example = item.get('example', '')
     
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        if not isinstance(data, list):
-            return issues
+    # Check translation - most critical
+    for issue in check_thai_translation(translation):
+        issues.append({
+            'field': 'translation',
+            'value': translation,
+            'type': issue['type'],
+            'message': issue['message'],
+            'severity': issue['severity']
+        })
+    
+    # Check example - check for grammar
+    if example and len(example) > 10:
+        for issue in check_english_grammar(example, 'sentence'):
+            issues.append({
+                'field': 'example',
+                'value': example,
+                'type': issue['type'],
+                'message': issue['message'],
+                'severity': issue['severity']
+            })
+    
+    return issues
+
+def check_vocab_columns(items):
+    """check_vocab_item for a list of items, one column scan per rule"""
+    translations = [item.get('translation', '') for item in items]
+    examples = [item.get('example', '') for item in items]
+    translation_issues = check_thai_translation_batch(translations)
+    example_issues = check_english_grammar_batch(
+        [example if example and len(example) > 10 else '' for example in examples], 'sentence')
+    
+    results = []
+    for translation, example, trans_found, ex_found in zip(translations, examples,
+                                                            translation_issues, example_issues):
+        item_issues = [{'field': 'translation', 'value': translation, 'type': issue['type'],
+                        'message': issue['message'], 'severity': issue['severity']}
+                       for issue in trans_found]
+        item_issues += [{'field': 'example', 'value': example, 'type': issue['type'],
+                         'message': issue['message'], 'severity': issue['severity']}
+                        for issue in ex_found]
+        results.append(item_issues)
+    return results
+
+VOCAB_RULE = 'smart.vocab_item'
+VOCAB_RULE_VERSION = rule_version(check_vocab_item, check_thai_translation, check_english_grammar)
+
+def check_vocab_items(data, file_name, cache=None):
+    """Check the items of one vocabulary file"""
+    issues = []
+    
+    if not isinstance(data, list):
+        return issues
+    
+    if cache is None:
+        batch_issues = iter(check_vocab_columns([item for item in data if isinstance(item, dict)]))
+    
+    for idx, item in enumerate(data):
+        if not isinstance(item, dict):
+            continue
         
-        for idx, item in enumerate(data):
-            if not isinstance(item, dict):
-                continue
-            
-            item_id = item.get('id', f'unknown_{idx}')
-            word = item.get('word', '')
-            translation = item.get('translation', '')
-            example = item.get('example', '')
-            
-            # Check translation - most critical
-            trans_issues = check_thai_translation(translation)
-            if trans_issues:
-                for issue in trans_issues:
-                    issues.append({
-                        'id': item_id,
-                        'file': filepath.name,
-                        'field': 'translation',
-                        'value': translation,
-                        'type': issue['type'],
-                        'message': issue['message'],
-                        'severity': issue['severity']
-                    })
-            
-            # Check example - check for grammar
-            if example and len(example) > 10:
-                ex_issues = check_english_grammar(example, 'sentence')
-                for issue in ex_issues:
-                    issues.append({
-                        'id': item_id,
-                        'file': filepath.name,
-                        'field': 'example',
-                        'value': example,
-                        'type': issue['type'],
-                        'message': issue['message'],
-                        'severity': issue['severity']
-                    })
+        item_id = item.get('id', f'unknown_{idx}')
+        if cache is None:
+            item_issues = next(batch_issues)
+        else:
+            item_issues = cache.check(VOCAB_RULE, VOCAB_RULE_VERSION, item, check_vocab_item)
+        issues.extend({'id': item_id, 'file': file_name, **issue} for issue in item_issues)
     
+    return issues
+
+def check_vocab_file(filepath, cache=None):
+    """Check a vocabulary file"""
+    try:
+        data = json_codec.load(filepath)
+        return check_vocab_items(data, filepath.name, cache)
     except Exception as e:
-        pass
+        return []
+
+def check_passage(passage):
+    """Issues in one reading passage and its questions, without the file"""
+    issues = []
+    passage_id = passage.get('id', 'unknown')
+    content = passage.get('content', '')
+    
+    # Check for obvious grammar issues
+    for issue in check_english_grammar(content, 'passage'):
+        issues.append({
+            'id': passage_id,
+            'field': 'content',
+            'type': issue['type'],
+            'message': issue['message'],
+            'severity': issue['severity']
+        })
+    
+    # Check questions
+    if 'questions' in passage and isinstance(passage['questions'], list):
+        for q_idx, question in enumerate(passage['questions']):
+            q_id = question.get('id', f'q_{q_idx}')
+            stem = question.get('stem', '')
+            
+            for issue in check_english_grammar(stem, 'question'):
+                issues.append({
+                    'id': q_id,
+                    'field': 'question_stem',
+                    'value': stem,
+                    'type': issue['type'],
+                    'message': issue['message'],
+                    'severity': issue['severity']
+                })
     
     return issues
 
-def check_reading_passage(filepath):
+PASSAGE_RULE = 'smart.passage'
+PASSAGE_RULE_VERSION = rule_version(check_passage, check_english_grammar)
+
+def check_reading_passage(filepath, cache=None):
     """Check reading passage file"""
     issues = []
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = json_codec.load(filepath)
         
         if not isinstance(data, list):
             return issues
@@ -192,45 +343,19 @@ def check_reading_passage(filepath):
             if not isinstance(passage, dict):
                 continue
             
-            passage_id = passage.get('id', 'unknown')
-            content = passage.get('content', '')
-            
-            # Check for obvious grammar issues
-            gram_issues = check_english_grammar(content, 'passage')
-            for issue in gram_issues:
-                issues.append({
-                    'id': passage_id,
-                    'file': filepath.name,
-                    'field': 'content',
-                    'type': issue['type'],
-                    'message': issue['message'],
-                    'severity': issue['severity']
-                })
-            
-            # Check questions
-            if 'questions' in passage and isinstance(passage['questions'], list):
-                for q_idx, question in enumerate(passage['questions']):
-                    q_id = question.get('id', f'q_{q_idx}')
-                    stem = question.get('stem', '')
-                    
-                    q_issues = check_english_grammar(stem, 'question')
-                    for issue in q_issues:
-                        issues.append({
-                            'id': q_id,
-                            'file': filepath.name,
-                            'field': 'question_stem',
-                            'value': stem,
-                            'type': issue['type'],
-                            'message': issue['message'],
-                            'severity': issue['severity']
-                        })
+            if cache is None:
+                passage_issues = check_passage(passage)
+            else:
+                passage_issues = cache.check(PASSAGE_RULE, PASSAGE_RULE_VERSION, passage, check_passage)
+            issues.extend({'id': issue['id'], 'file': filepath.name, **issue} for issue in passage_issues)
     
     except Exception as e:
         pass
     
     return issues
 
-def main():
+def run_validation(args, cache=None, sink=None):
+    """Check vocab and reading passages and report (or stream) the issues found"""
     print("="*100)
     print("SMART APP CONTENT VALIDATION")
     print("Focusing on Real Grammar and Translation Issues")
@@ -247,10 +372,21 @@ def main():
     
     # Check vocab files
     print(f"\nChecking VOCAB files...")
-    vocab_files = sorted(data_dir.glob('vocab_part*.json'))
-    for vocab_file in vocab_files:
-        issues = check_vocab_file(vocab_file)
-        if issues:
+    if args.vocab_store:
+        # One parse of the consolidated store instead of one per part file
+        results = (check_vocab_items(items, file_name, cache)
+                   for file_name, items in iter_store_files(load_store(args.vocab_store))
+                   if file_name.startswith('vocab_part'))
+    elif cache:
+        # Cache lookups are cheap; only changed items are re-checked
+        results = (check_vocab_file(path, cache) for path in sorted(data_dir.glob('vocab_part*.json')))
+    else:
+        vocab_files = sorted(data_dir.glob('vocab_part*.json'))
+        results = imap_files(check_vocab_file, vocab_files, args.jobs)
+    for issues in results:
+        if sink:
+            sink.extend({**issue, 'category': 'vocab', 'rule': VOCAB_RULE} for issue in issues)
+        elif issues:
             all_issues['vocab'].extend(issues)
         total_checked += 1
         if total_checked % 20 == 0:
@@ -260,8 +396,11 @@ def main():
     print(f"\nChecking READING PASSAGES...")
     passage_file = data_dir / 'reading_passages.json'
     if passage_file.exists():
-        issues = check_reading_passage(passage_file)
-        all_issues['reading_passages'].extend(issues)
+        issues = check_reading_passage(passage_file, cache)
+        if sink:
+            sink.extend({**issue, 'category': 'reading_passages', 'rule': PASSAGE_RULE} for issue in issues)
+        else:
+            all_issues['reading_passages'].extend(issues)
         total_checked += 1
     
     # Summary
@@ -269,11 +408,34 @@ def main():
     print(f"VALIDATION SUMMARY")
     print(f"{'='*100}")
     
-    total_issues = sum(len(v) for v in all_issues.values())
+    total_issues = sink.total if sink else sum(len(v) for v in all_issues.values())
     print(f"Files checked: {total_checked}")
     print(f"Real issues found: {total_issues}")
+    if cache:
+        cache.save()
+        print(cache.stats())
     
-    if total_issues > 0:
+    if sink and total_issues > 0:
+        print(f"\n{'='*100}")
+        print(f"ISSUES BY SEVERITY")
+        print(f"{'='*100}")
+        
+        for severity in ['high', 'medium', 'low']:
+            if severity in sink.counts['severity']:
+                print(f"\n{severity.upper()}: {sink.counts['severity'][severity]} issues")
+        
+        print(f"\nBy type:")
+        for issue_type, count in sorted(sink.counts['type'].items(), key=lambda x: -x[1]):
+            print(f"  {issue_type}: {count}")
+            
+            # Show first 3 examples
+            for item in sink.examples('type', issue_type)[:3]:
+                print(f"    - {item['id']} ({item['file']})")
+                print(f"      {item['message']}")
+            
+            if count > 3:
+                print(f"    ... and {count - 3} more")
+    elif total_issues > 0:
         print(f"\n{'='*100}")
         print(f"ISSUES BY SEVERITY")
         print(f"{'='*100}")
@@ -309,6 +471,12 @@ def main():
     else:
         print("\n✅ No real issues found!")
     
+    if sink:
+        sink.close(files_checked=total_checked,
+                   status='PASSED' if total_issues == 0 else 'NEEDS_REVIEW')
+        print(f"\n📄 Issues streamed to: {sink.path.name}, summary: {sink.summary_path.name}")
+        return
+    
     # Save report
     report_path = Path('c:/Users/chawa/Downloads/App Test/eng_pocket/scripts/smart_content_validation.json')
     
@@ -322,10 +490,29 @@ def main():
         'all_issues': all_issues
     }
     
-    with open(report_path, 'w', encoding='utf-8') as f:
-        json.dump(report_data, f, ensure_ascii=False, indent=2)
+    json_codec.dump_pretty(report_data, report_path)
     
     print(f"\n📄 Detailed report saved to: smart_content_validation.json")
 
+def main():
+    parser = argparse.ArgumentParser(description="Smart grammar and translation checker")
+    add_jobs_argument(parser)
+    add_cache_argument(parser)
+    parser.add_argument('--vocab-store', type=Path,
+                        help='read vocab from a consolidated store built by vocab_store.py')
+    parser.add_argument('--jsonl', type=Path,
+                        help='stream issues to this JSONL file and write a .summary.json next to it '
+                             'instead of the full report')
+    args = parser.parse_args()
+    if args.cache and args.jobs > 1:
+        parser.error('--jobs has no effect with --cache: cached checks run in-process')
+    cache = ValidationCache(args.cache) if args.cache else None
+    if args.jsonl:
+        # The sink's temporary file is removed if the run fails
+        with IssueSink(args.jsonl, COUNT_FIELDS + ('category',)) as sink:
+            run_validation(args, cache, sink)
+    else:
+        run_validation(args, cache)
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rule registry for stem checks and fixes
+Literal phrases and regex rules are each joined into one compiled
+alternation, so checking a clean stem costs one C-level search instead of
+one search per rule. RewriteRules does the same for the
+fixers' ordered search-and-replace rules.
+"""
+import re
+from collections import namedtuple
+
+Rule = namedtuple('Rule', 'name kind pattern message meta')
+Hit = namedtuple('Hit', 'rule start end text')
+Rewrite = namedtuple('Rewrite', 'name regex replacement')
+
+
+class RuleSet:
+    """Registry of named phrase and regex rules behind single-pass gates
+
+    Phrase rules match case-insensitively anywhere in the text, like the
+    `phrase in stem.lower()` checks they replace. Regex rules keep their own
+    flags through scoped inline groups. All phrases are joined into one
+    compiled alternation and all regexes into another; a text neither gate
+    matches (almost every stem) costs one C-level search each. Only texts
+    that pass a gate are scanned rule by rule, so overlapping hits are all
+    reported.
+    """
+
+    def __init__(self):
+        self.rules = {}
+        self._phrase_rules = {}
+        self._phrase_gate = None
+        self._regex_rules = []
+        self._regex_gate = None
+        self._compiled = False
+
+    def phrase(self, name, phrase, message=None, **meta):
+        """Register a literal phrase rule"""
+        self._add(Rule(name, 'phrase', phrase.lower(), message or name, meta))
+
+    def regex(self, name, pattern, message=None, flags=0, **meta):
+        """Register a regex rule"""
+        self._add(Rule(name, 'regex', (pattern, flags), message or name, meta))
+
+    def _add(self, rule):
+        if rule.name in self.rules:
+            raise ValueError(f"Duplicate rule name: {rule.name}")
+        self.rules[rule.name] = rule
+        self._compiled = False
+
+    def compile(self):
+        """Build the phrase and regex gates"""
+        self._phrase_rules = {}
+        self._regex_rules = []
+        for rule in self.rules.values():
+            if rule.kind == 'phrase':
+                self._phrase_rules.setdefault(rule.pattern, []).append(rule)
+            else:
+                pattern, flags = rule.pattern
+                self._regex_rules.append((rule, re.compile(pattern, flags)))
+
+        # Longest first, so the alternation never stops at a shorter prefix
+        phrases = sorted(self._phrase_rules, key=len, reverse=True)
+        self._phrase_gate = re.compile('|'.join(map(re.escape, phrases))) if phrases else None
+        self._regex_gate = (re.compile('|'.join(_scoped(*rule.pattern) for rule, _ in self._regex_rules))
+                            if self._regex_rules else None)
+        self._compiled = True
+        return self
+
+    def scan(self, text):
+        """Return every Hit in the text, ordered by position"""
+        if not self._compiled:
+            self.compile()
+
+        hits = []
+        if self._phrase_gate is not None:
+            lower = text.lower()
+            if self._phrase_gate.search(lower):
+                for phrase, rules in self._phrase_rules.items():
+                    start = lower.find(phrase)
+                    while start != -1:
+                        end = start + len(phrase)
+                        hits.extend(Hit(rule, start, end, text[start:end]) for rule in rules)
+                        start = lower.find(phrase, start + 1)
+
+        if self._regex_gate is not None and self._regex_gate.search(text):
+            for rule, regex in self._regex_rules:
+                for match in regex.finditer(text):
+                    hits.append(Hit(rule, match.start(), match.end(), match.group()))
+
+        hits.sort(key=lambda hit: hit.start)
+        return hits
+
+    def fired(self, text):
+        """Rules that matched the text, each once, in order of first hit"""
+        seen = {}
+        for hit in self.scan(text):
+            seen.setdefault(hit.rule.name, hit)
+        return list(seen.values())
+
+
+class RewriteRules:
+    """Ordered search-and-replace rules compiled once
+
+    Rules apply in registration order, each seeing the previous one's output.
+    All patterns are also joined into one gate regex: a text the gate does
+    not match cannot be changed by any rule, so clean stems cost one scan and
+    only matching ones run the subn chain. A rule is reported only when it
+    actually changed the text.
+    """
+
+    def __init__(self):
+        self.rules = []
+        self._sources = []
+        self._gate = None
+
+    def phrase(self, name, phrase, replacement):
+        """Replace a literal phrase, matched case-insensitively"""
+        self.regex(name, re.escape(phrase), replacement, re.IGNORECASE)
+
+    def regex(self, name, pattern, replacement, flags=0):
+        """Replace every match of a regex (replacement may use backreferences)"""
+        if any(rule.name == name for rule in self.rules):
+            raise ValueError(f"Duplicate rule name: {name}")
+        self.rules.append(Rewrite(name, re.compile(pattern, flags), replacement))
+        self._sources.append(_scoped(pattern, flags))
+        self._gate = None
+
+    def compile(self):
+        """Build the gate regex"""
+        self._gate = re.compile('|'.join(self._sources)) if self._sources else None
+        return self
+
+    def apply(self, text):
+        """Return (new text, [(rule name, substitutions), ...]) for the rules that changed it"""
+        if self._gate is None:
+            self.compile()
+        if self._gate is None or not self._gate.search(text):
+            return text, []
+        changes = []
+        for rule in self.rules:
+            new_text, count = rule.regex.subn(rule.replacement, text)
+            if count and new_text != text:
+                changes.append((rule.name, count))
+                text = new_text
+        return text, changes
+
+
+_INLINE_FLAGS = {re.IGNORECASE: 'i', re.MULTILINE: 'm', re.DOTALL: 's', re.VERBOSE: 'x'}
+
+
+def _scoped(pattern, flags):
+    """Wrap a pattern so its flags only apply inside the combined alternation"""
+    letters = ''.join(letter for flag, letter in _INLINE_FLAGS.items() if flags & flag)
+    return f"(?{letters}:{pattern})" if letters else f"(?:{pattern})"
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Regression tests for the near-duplicate question finder (near_duplicates.py)
+Run with: python -m pytest scripts/test_near_duplicates.py
+"""
+from near_duplicates import find_near_duplicates
+
+
+def question(stem, choices=('teaching', 'taught', 'teach', 'teaches')):
+    return {'stem': stem, 'choices': list(choices)}
+
+
+def test_same_agreement_pronouns_cluster():
+    questions = [
+        question("He _____ English every weekend."),
+        question("She _____ English every weekend."),
+    ]
+    assert find_near_duplicates(questions) == [[0, 1]]
+
+
+def test_different_agreement_pronouns_stay_apart():
+    questions = [
+        question("He _____ English every weekend."),
+        question("They _____ English every weekend."),
+    ]
+    assert find_near_duplicates(questions) == []
+
+
+def test_unrelated_questions_stay_apart():
+    questions = [
+        question("He _____ English every weekend."),
+        question("I _____ my homework yesterday.", ('do', 'did', 'done', 'doing')),
+    ]
+    assert find_near_duplicates(questions) == []
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Round-trip tests for the packed binary quiz bank (quiz_pack.py)
+Run with: python -m pytest scripts/test_quiz_pack.py
+"""
+import pytest
+
+import json_codec
+from quiz_pack import QUIZ_DIR, PackedQuizBank, pack_quiz
+
+SYNTHETIC_BANK = {
+    "easy": [
+        {
+            "stem": "She _____ to school every day.",
+            "choices": ["go", "goes", "going", "gone"],
+            "correctIndex": 1,
+            "explanation": "ประธานเอกพจน์บุรุษที่ 3 ใช้ goes",
+            "id": "syn_easy_0001",
+            "skillType": "grammar",
+            "packId": "grammar_synthetic",
+        },
+        {
+            # Fewer than 4 choices
+            "stem": "They _____ happy.",
+            "choices": ["is", "are"],
+            "correctIndex": 1,
+            "explanation": "They ใช้ are",
+            "id": "syn_easy_0002",
+            "skillType": "grammar",
+            "packId": "grammar_synthetic",
+        },
+    ],
+    "medium": [
+        {
+            # No explanation
+            "stem": "I _____ finished my homework.",
+            "choices": ["has", "have", "having", "had been"],
+            "correctIndex": 1,
+            "id": "syn_medium_0001",
+            "skillType": "grammar",
+            "packId": "grammar_synthetic",
+        },
+    ],
+    "hard": [],
+}
+
+
+def assert_round_trip(data, path):
+    pack_quiz(data, path)
+    with PackedQuizBank(path) as bank:
+        assert list(bank.sections) == list(data)
+        for difficulty, questions in data.items():
+            assert bank.count(difficulty) == len(questions)
+            for n, q in enumerate(questions):
+                assert bank.question(difficulty, n) == q
+
+
+def test_real_quiz_file(tmp_path):
+    quiz_file = sorted(QUIZ_DIR.glob("grammar_quiz_*.json"))[0]
+    assert_round_trip(json_codec.load(quiz_file), tmp_path / "real.bin")
+
+
+def test_synthetic_bank(tmp_path):
+    assert_round_trip(SYNTHETIC_BANK, tmp_path / "synthetic.bin")
+
+
+def test_short_choices_and_missing_field(tmp_path):
+    path = tmp_path / "synthetic.bin"
+    pack_quiz(SYNTHETIC_BANK, path)
+    with PackedQuizBank(path) as bank:
+        assert bank.question("easy", 1)["choices"] == ["is", "are"]
+        assert "explanation" not in bank.question("medium", 0)
+
+
+def test_out_of_range_question(tmp_path):
+    path = tmp_path / "synthetic.bin"
+    pack_quiz(SYNTHETIC_BANK, path)
+    with PackedQuizBank(path) as bank:
+        with pytest.raises(IndexError):
+            bank.question("easy", 2)
+        with pytest.raises(IndexError):
+            bank.question("medium", -1)
+        with pytest.raises(IndexError):
+            bank.question("hard", 0)
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parity tests for the column checks in smart_content_validation.py
+Run with: python -m pytest scripts/test_smart_content_validation.py
+"""
+import random
+
+import pytest
+
+from smart_content_validation import (check_english_grammar, check_english_grammar_batch,
+                                      check_thai_translation, check_thai_translation_batch)
+
+WORDS = ['She', 'goes', 'to', 'school', 'eating', 'abandoned', 'taken', 'are', 'is', 'am',
+         'have', 'has', 'a', 'apple', 'an', 'Every', 'day', 'ไป', 'โรงเรียน', '...', '-', '.']
+SPACES = ['', ' ', '  ', '\n', '\t']
+ENDINGS = ['', '.', '!', '?', '\n']
+
+
+def random_strings(seed, count=5000):
+    """Short word strings with random inner, leading and trailing whitespace"""
+    rng = random.Random(seed)
+    texts = ['', '  eating', '  abandoned', 'abandoned  ', 'Eating   ', '...', '-.-']
+    for _ in range(count):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(1, 6))]
+        text = rng.choice(SPACES).join(words) if rng.random() < 0.3 else ' '.join(words)
+        texts.append(rng.choice(SPACES) + text + rng.choice(ENDINGS) + rng.choice(SPACES))
+    return texts
+
+
+@pytest.mark.parametrize('context', ['general', 'sentence', 'passage'])
+def test_english_batch_matches_scalar(context):
+    texts = random_strings(1)
+    assert check_english_grammar_batch(texts, context) == [check_english_grammar(t, context) for t in texts]
+
+
+def test_thai_batch_matches_scalar():
+    texts = random_strings(2)
+    assert check_thai_translation_batch(texts) == [check_thai_translation(t) for t in texts]
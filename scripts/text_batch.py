@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Column-at-a-time text checks
+Joins a whole column of strings (every translation, every example, ...) into
+one NUL-separated buffer so each rule is a single compiled-regex scan
+instead of one interpreter round trip per string. Matches are mapped back to
+items through the offset table, giving a 0/1 mask per rule.
+
+Patterns see item boundaries as NUL characters: use (?<![^\\x00]) for
+"start of item" and (?![^\\x00]) for "end of item", and keep character
+classes from crossing a boundary (e.g. [^\\x00]* instead of .*).
+"""
+import bisect
+
+SEPARATOR = "\x00"
+
+
+class TextColumn:
+    """A column of strings packed into one buffer with item offsets"""
+
+    def __init__(self, texts):
+        self.texts = list(texts)
+        self.starts = []
+        position = 0
+        for text in self.texts:
+            self.starts.append(position)
+            position += len(text) + 1
+        self.buffer = SEPARATOR.join(self.texts)
+
+    def __len__(self):
+        return len(self.texts)
+
+    def item_at(self, position):
+        """Index of the item containing a buffer position"""
+        return bisect.bisect_right(self.starts, position) - 1
+
+    def mask(self, pattern):
+        """bytearray with 1 for every item the compiled pattern matches in"""
+        mask = bytearray(len(self.texts))
+        search = pattern.search
+        buffer = self.buffer
+        position = 0
+        while True:
+            match = search(buffer, position)
+            if match is None:
+                return mask
+            item = self.item_at(match.start())
+            mask[item] = 1
+            if item + 1 == len(self.starts):
+                return mask
+            # One hit per item is enough; resume at the next item
+            position = self.starts[item + 1]
+
+    def lengths(self):
+        return [len(text) for text in self.texts]
@@ -6,12 +6,18 @@ Comprehensive grammar and translation checker for all app content
 - Translation accuracy checking
 - Consistency checks
 """
-import json
+import argparse
 import re
 from pathlib import Path
 from collections import defaultdict
 import os
 
+from file_pool import add_jobs_argument, imap_files
+from issue_sink import COUNT_FIELDS, IssueSink
+import json_codec
+from validation_cache import ValidationCache, add_cache_argument, rule_version
+from vocab_store import iter_store_files, load_store
+
 # Grammar patterns to check
 GRAMMAR_ISSUES = {
     'capitalization': [],
@@ -149,56 +155,97 @@ def check_thai_translation(text):
     
     return issues
 
-def check_vocab_file(filepath):
-    """Check a vocabulary file"""
+def check_vocab_item(item):
+    """(type, message, field) issues in one vocabulary-style item"""
     issues = []
     
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        if not isinstance(data, list):
-            return issues
-        
-        for idx, item in enumerate(data):
-            item_issues = {
-                'file': filepath.name,
-                'index': idx,
-                'id': item.get('id', 'unknown'),
-                'word': item.get('word', ''),
-                'issues': []
-            }
-            
-            # Check word
-            if 'word' in item:
-                word_issues = check_english_grammar(item['word'])
-                item_issues['issues'].extend([(issue['type'], issue['message'], 'word') for issue in word_issues])
-            
-            # Check translation
-            if 'translation' in item:
-                trans_issues = check_thai_translation(item['translation'])
-                item_issues['issues'].extend([(issue['type'], issue['message'], 'translation') for issue in trans_issues])
-            
-            # Check example
-            if 'example' in item:
-                ex_issues = check_english_grammar(item['example'])
-                item_issues['issues'].extend([(issue['type'], issue['message'], 'example') for issue in ex_issues])
-            
-            if item_issues['issues']:
-                issues.append(item_issues)
+    # Check word
+    if 'word' in item:
+        word_issues = check_english_grammar(item['word'])
+        issues.extend([(issue['type'], issue['message'], 'word') for issue in word_issues])
     
-    except Exception as e:
-        pass
+    # Check translation
+    if 'translation' in item:
+        trans_issues = check_thai_translation(item['translation'])
+        issues.extend([(issue['type'], issue['message'], 'translation') for issue in trans_issues])
+    
+    # Check example
+    if 'example' in item:
+        ex_issues = check_english_grammar(item['example'])
+        issues.extend([(issue['type'], issue['message'], 'example') for issue in ex_issues])
+    
+    return issues
+
+def check_quiz_item(quiz):
+    """(type, message, field) issues in one quiz question"""
+    issues = []
+    
+    # Check stem
+    if 'stem' in quiz:
+        stem_issues = check_english_grammar(quiz['stem'])
+        issues.extend([(issue['type'], issue['message'], 'stem') for issue in stem_issues])
+    
+    # Check choices
+    if 'choices' in quiz and isinstance(quiz['choices'], list):
+        for choice_idx, choice in enumerate(quiz['choices']):
+            choice_issues = check_english_grammar(str(choice))
+            issues.extend([(issue['type'], issue['message'], f'choice_{choice_idx}') for issue in choice_issues])
+    
+    # Check explanation
+    if 'explanation' in quiz:
+        exp_issues = check_english_grammar(quiz['explanation'])
+        issues.extend([(issue['type'], issue['message'], 'explanation') for issue in exp_issues])
+    
+    return issues
+
+VOCAB_RULE = 'app.vocab_item'
+VOCAB_RULE_VERSION = rule_version(check_vocab_item, check_english_grammar, check_thai_translation,
+                                  data=THAI_PATTERNS)
+QUIZ_RULE = 'app.quiz_item'
+QUIZ_RULE_VERSION = rule_version(check_quiz_item, check_english_grammar)
+
+def cached_item_issues(cache, rule, version, item, func):
+    """func(item), served from the cache when the item is unchanged"""
+    if cache is None:
+        return func(item)
+    # The cache stores JSON, so issue tuples come back as lists
+    return [tuple(issue) for issue in cache.check(rule, version, item, func)]
+
+def check_vocab_items(data, file_name, cache=None):
+    """Check the items of one vocabulary-style file"""
+    issues = []
+    
+    if not isinstance(data, list):
+        return issues
+    
+    for idx, item in enumerate(data):
+        item_issues = {
+            'file': file_name,
+            'index': idx,
+            'id': item.get('id', 'unknown'),
+            'word': item.get('word', ''),
+            'issues': cached_item_issues(cache, VOCAB_RULE, VOCAB_RULE_VERSION, item, check_vocab_item)
+        }
+        
+        if item_issues['issues']:
+            issues.append(item_issues)
     
     return issues
 
-def check_quiz_file(filepath):
+def check_vocab_file(filepath, cache=None):
+    """Check a vocabulary file"""
+    try:
+        data = json_codec.load(filepath)
+        return check_vocab_items(data, filepath.name, cache)
+    except Exception as e:
+        return []
+
+def check_quiz_file(filepath, cache=None):
     """Check a quiz file"""
     issues = []
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = json_codec.load(filepath)
         
         # Handle both array and object formats
         if isinstance(data, dict):
@@ -214,25 +261,9 @@ def check_quiz_file(filepath):
                 'file': filepath.name,
                 'index': idx,
                 'id': quiz.get('id', 'unknown'),
-                'issues': []
+                'issues': cached_item_issues(cache, QUIZ_RULE, QUIZ_RULE_VERSION, quiz, check_quiz_item)
             }
             
-            # Check stem
-            if 'stem' in quiz:
-                stem_issues = check_english_grammar(quiz['stem'])
-                item_issues['issues'].extend([(issue['type'], issue['message'], 'stem') for issue in stem_issues])
-            
-            # Check choices
-            if 'choices' in quiz and isinstance(quiz['choices'], list):
-                for choice_idx, choice in enumerate(quiz['choices']):
-                    choice_issues = check_english_grammar(str(choice))
-                    item_issues['issues'].extend([(issue['type'], issue['message'], f'choice_{choice_idx}') for issue in choice_issues])
-            
-            # Check explanation
-            if 'explanation' in quiz:
-                exp_issues = check_english_grammar(quiz['explanation'])
-                item_issues['issues'].extend([(issue['type'], issue['message'], 'explanation') for issue in exp_issues])
-            
             if item_issues['issues']:
                 issues.append(item_issues)
     
@@ -241,7 +272,19 @@ def check_quiz_file(filepath):
     
     return issues
 
-def main():
+def is_vocab_category(category):
+    """Whether a category's files hold vocabulary-style items rather than quizzes"""
+    return 'vocab' in category or 'passages' in category or 'topics' in category
+
+def check_category_file(task, cache=None):
+    """Check one (category, filepath) pair with the checker for its category"""
+    category, filepath = task
+    if is_vocab_category(category):
+        return check_vocab_file(filepath, cache)
+    return check_quiz_file(filepath, cache)
+
+def run_validation(args, cache=None, sink=None):
+    """Check every content file and report (or stream) the issues found"""
     print("="*100)
     print("COMPREHENSIVE APP CONTENT VALIDATION")
     print("Checking Grammar, Spelling, and Translations")
@@ -260,6 +303,25 @@ def main():
     total_files = 0
     total_issues = 0
     
+    # With a vocab store, vocab parts come from one parse of the store
+    store_results = {}
+    if args.vocab_store:
+        vocab_names = {filepath.name for filepath in files_to_check['vocab']}
+        store_results = {file_name: check_vocab_items(items, file_name, cache)
+                         for file_name, items in iter_store_files(load_store(args.vocab_store))
+                         if file_name in vocab_names}
+    
+    # Check every other file (in parallel with --jobs), consuming results in report order
+    tasks = [(category, filepath)
+             for category, files in files_to_check.items()
+             for filepath in files
+             if filepath.exists() and not (category == 'vocab' and filepath.name in store_results)]
+    if cache:
+        # Cache lookups are cheap; only changed records are re-checked
+        results = (check_category_file(task, cache) for task in tasks)
+    else:
+        results = imap_files(check_category_file, tasks, args.jobs)
+    
     for category, files in files_to_check.items():
         print(f"\n{'='*100}")
         print(f"Checking {category.upper()} ({len(files)} files)")
@@ -271,13 +333,21 @@ def main():
             
             total_files += 1
             
-            if 'vocab' in category or 'passages' in category or 'topics' in category:
-                issues = check_vocab_file(filepath)
+            if category == 'vocab' and filepath.name in store_results:
+                issues = store_results.pop(filepath.name)
             else:
-                issues = check_quiz_file(filepath)
+                issues = next(results)
             
             if issues:
-                all_issues[category].extend(issues)
+                if sink:
+                    rule = VOCAB_RULE if is_vocab_category(category) else QUIZ_RULE
+                    for item in issues:
+                        for issue_type, message, field in item['issues']:
+                            sink.add({'category': category, 'file': item['file'], 'index': item['index'],
+                                      'id': item['id'], 'field': field, 'type': issue_type,
+                                      'message': message, 'rule': rule})
+                else:
+                    all_issues[category].extend(issues)
                 total_issues += len(issues)
                 print(f"  {filepath.name}: {len(issues)} potential issues")
             else:
@@ -289,8 +359,22 @@ def main():
     print(f"{'='*100}")
     print(f"Files checked: {total_files}")
     print(f"Potential issues found: {total_issues}")
+    if cache:
+        cache.save()
+        print(cache.stats())
     
-    if total_issues > 0:
+    if sink and total_issues > 0:
+        print(f"\n{'='*100}")
+        print(f"ISSUES FOUND BY CATEGORY")
+        print(f"{'='*100}")
+        
+        for category, count in sink.counts['category'].items():
+            print(f"\n{category.upper()}: {count} issues")
+            # Show first 5
+            for issue in sink.examples('category', category):
+                print(f"  - {issue['id']} (in {issue['file']})")
+                print(f"      • {issue['type']}: {issue['message']}")
+    elif total_issues > 0:
         print(f"\n{'='*100}")
         print(f"ISSUES FOUND BY CATEGORY")
         print(f"{'='*100}")
@@ -306,6 +390,12 @@ def main():
                     if len(item['issues']) > 3:
                         print(f"      ... and {len(item['issues']) - 3} more")
     
+    if sink:
+        sink.close(total_files=total_files, items_with_issues=total_issues,
+                   status='PASSED' if total_issues == 0 else 'NEEDS REVIEW')
+        print(f"\n📄 Issues streamed to: {sink.path.name}, summary: {sink.summary_path.name}")
+        return
+    
     # Save detailed report
     report_path = Path('c:/Users/chawa/Downloads/App Test/eng_pocket/scripts/app_content_validation_report.json')
     
@@ -319,10 +409,29 @@ def main():
         'detailed_issues': all_issues
     }
     
-    with open(report_path, 'w', encoding='utf-8') as f:
-        json.dump(report_data, f, ensure_ascii=False, indent=2)
+    json_codec.dump_pretty(report_data, report_path)
     
     print(f"\n📄 Detailed report saved to: app_content_validation_report.json")
 
+def main():
+    parser = argparse.ArgumentParser(description="Validate grammar and translations in app content")
+    add_jobs_argument(parser)
+    add_cache_argument(parser)
+    parser.add_argument('--vocab-store', type=Path,
+                        help='read vocab from a consolidated store built by vocab_store.py')
+    parser.add_argument('--jsonl', type=Path,
+                        help='stream issues to this JSONL file and write a .summary.json next to it '
+                             'instead of the full report')
+    args = parser.parse_args()
+    if args.cache and args.jobs > 1:
+        parser.error('--jobs has no effect with --cache: cached checks run in-process')
+    cache = ValidationCache(args.cache) if args.cache else None
+    if args.jsonl:
+        # The sink's temporary file is removed if the run fails
+        with IssueSink(args.jsonl, COUNT_FIELDS + ('category',)) as sink:
+            run_validation(args, cache, sink)
+    else:
+        run_validation(args, cache)
+
 if __name__ == '__main__':
     main()
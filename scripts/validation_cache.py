@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Content-addressed validation cache shared by the validators
+Maps a hash of each record to the issues a rule found in it, so reruns only
+re-check records that changed. Each rule carries a version derived from the
+source of the functions it runs; editing a check changes the version and
+evicts everything that rule had cached.
+
+Cache layout:
+    {
+      "format": "validation-cache-v1",
+      "run": 12,
+      "rules": {
+        "<rule>": {"version": "<hash>", "entries": {"<record hash>": [last run, issues]}}
+      }
+    }
+
+Entries not used for MAX_IDLE_RUNS runs are dropped on save, which clears out
+old revisions of edited records.
+"""
+import hashlib
+import inspect
+import os
+from pathlib import Path
+
+import json_codec
+
+CACHE_PATH = Path(__file__).parent / ".validation_cache.json"
+
+FORMAT = "validation-cache-v1"
+MAX_IDLE_RUNS = 5
+
+
+def rule_version(*funcs, data=None):
+    """Version of a rule: hash of the source of every function it runs
+
+    data holds the module-level tables those functions read (pattern dicts,
+    word lists...), so editing a table invalidates the cached issues too.
+    """
+    digest = hashlib.sha256()
+    for func in funcs:
+        digest.update(inspect.getsource(func).encode("utf-8"))
+    if data is not None:
+        digest.update(json_codec.dumps_compact(data, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def record_hash(record):
+    """Stable content hash of a JSON record"""
+    raw = json_codec.dumps_compact(record, sort_keys=True)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class ValidationCache:
+    """On-disk issue cache keyed by (rule, rule version, record hash)"""
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = Path(path)
+        self.run = 0
+        self.rules = {}
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        if self.path.exists():
+            try:
+                data = json_codec.load(self.path)
+                if data.get("format") == FORMAT:
+                    self.run = data["run"]
+                    self.rules = data["rules"]
+            except (OSError, ValueError, KeyError):
+                pass  # a damaged cache is just a cold cache
+        self.run += 1
+
+    def _entries(self, rule, version):
+        cached = self.rules.get(rule)
+        if cached is None or cached["version"] != version:
+            cached = self.rules[rule] = {"version": version, "entries": {}}
+            self.dirty = True
+        return cached["entries"]
+
+    def check(self, rule, version, record, func):
+        """func(record), or its cached result when the record is unchanged"""
+        entries = self._entries(rule, version)
+        key = record_hash(record)
+        entry = entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            entry[0] = self.run
+            return entry[1]
+        self.misses += 1
+        self.dirty = True
+        issues = func(record)
+        entries[key] = [self.run, issues]
+        return issues
+
+    def save(self):
+        """Drop idle entries and write the cache atomically
+
+        A run that only hit the cache leaves the file alone; the run counter
+        advances with the next run that writes.
+        """
+        for cached in self.rules.values():
+            kept = {key: entry for key, entry in cached["entries"].items()
+                    if self.run - entry[0] < MAX_IDLE_RUNS}
+            if len(kept) != len(cached["entries"]):
+                cached["entries"] = kept
+                self.dirty = True
+        if not self.dirty:
+            return
+        raw = json_codec.dumps_compact({"format": FORMAT, "run": self.run, "rules": self.rules})
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(raw, encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def stats(self):
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0
+        return f"cache: {self.hits:,} hits, {self.misses:,} misses ({rate:.0f}% hit rate)"
+
+
+def add_cache_argument(parser):
+    """Add the standard --cache option to an argparse parser"""
+    parser.add_argument('--cache', nargs='?', type=Path, const=CACHE_PATH,
+                        help='reuse results for unchanged records from an on-disk cache '
+                             '(default file: scripts/.validation_cache.json); checks run in-process')
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Consolidated vocab store
+Merges vocab_stock_500.json and vocab_part2.json … vocab_part101.json into one
+vocab_store.json with precomputed lookup indexes, so "word by id" or "all
+basic nouns" is one dict lookup instead of up to 100 asset loads.
+
+The store is a build artifact for the scripts (scripts/build/, not bundled
+with the app). It records the sha256 of every source file, and load_store()
+rebuilds it when a source was edited, added or removed since the last build.
+
+Store layout:
+    {
+      "format": "vocab-store-v2",
+      "files": {"vocab_part2.json": [start, end], ...},   item range per source file
+      "dataDir": "/…/assets/data",                         directory the sources were read from
+      "sources": {"vocab_part2.json": "<sha256>", ...},   content hash per source file
+      "items": [{...}, ...],                                original items, file order
+      "indexes": {
+        "idToOffset": {"v0051": 50, ...},
+        "wordToIds": {"afford": ["v0051"], ...},           lowercased word
+        "levelToIds": {"basic": [...], ...},
+        "posToIds": {"verb": [...], ...}
+      }
+    }
+"""
+import argparse
+import hashlib
+import re
+from collections import defaultdict
+from pathlib import Path
+
+import json_codec
+
+DATA_DIR = Path(__file__).parent.parent / "assets" / "data"
+STORE_NAME = "vocab_store.json"
+STORE_PATH = Path(__file__).parent / "build" / STORE_NAME
+
+FORMAT = "vocab-store-v2"
+
+
+def find_vocab_sources(data_dir=DATA_DIR):
+    """The stock file followed by the numbered part files in numeric order"""
+    data_dir = Path(data_dir)
+    parts = sorted(data_dir.glob("vocab_part*.json"),
+                   key=lambda p: int(re.search(r"\d+", p.stem).group()))
+    stock = data_dir / "vocab_stock_500.json"
+    return ([stock] if stock.exists() else []) + parts
+
+
+def build_store(sources, data_dir=DATA_DIR):
+    """Merge vocab files (found in data_dir) into a store dict with its indexes"""
+    files = {}
+    hashes = {}
+    items = []
+    for path in sources:
+        raw = Path(path).read_bytes()
+        data = json_codec.loads(raw)
+        start = len(items)
+        items.extend(data)
+        files[Path(path).name] = [start, len(items)]
+        hashes[Path(path).name] = hashlib.sha256(raw).hexdigest()
+
+    id_to_offset = {}
+    word_to_ids = defaultdict(list)
+    level_to_ids = defaultdict(list)
+    pos_to_ids = defaultdict(list)
+    duplicate_ids = []
+
+    for offset, item in enumerate(items):
+        item_id = item.get("id")
+        if item_id in id_to_offset:
+            duplicate_ids.append(item_id)
+            continue
+        id_to_offset[item_id] = offset
+        word_to_ids[item.get("word", "").lower()].append(item_id)
+        level_to_ids[item.get("level", "")].append(item_id)
+        pos_to_ids[item.get("pos") or item.get("partOfSpeech", "")].append(item_id)
+
+    if duplicate_ids:
+        print(f"⚠️  {len(duplicate_ids)} duplicate ids kept out of the indexes, e.g. {duplicate_ids[:5]}")
+
+    return {
+        "format": FORMAT,
+        "files": files,
+        "dataDir": str(Path(data_dir).resolve()),
+        "sources": hashes,
+        "items": items,
+        "indexes": {
+            "idToOffset": id_to_offset,
+            "wordToIds": dict(word_to_ids),
+            "levelToIds": dict(level_to_ids),
+            "posToIds": dict(pos_to_ids),
+        },
+    }
+
+
+def save_store(store, path=STORE_PATH, pretty=False):
+    """Write a store, minified unless pretty"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if pretty:
+        json_codec.dump_pretty(store, path)
+    else:
+        json_codec.dump_compact(store, path)
+
+
+def stale_sources(store):
+    """Names of source files edited, added or removed since the store was built"""
+    current = {path.name: path for path in find_vocab_sources(store["dataDir"])}
+    recorded = store.get("sources", {})
+    stale = set(current).symmetric_difference(recorded)
+    for name, path in current.items():
+        if name in recorded and hashlib.sha256(path.read_bytes()).hexdigest() != recorded[name]:
+            stale.add(name)
+    return sorted(stale)
+
+
+def load_store(path=STORE_PATH):
+    """Load a vocab store, rebuilding it first if its sources changed
+
+    If the source directory is gone or a source cannot be parsed (an editor
+    mid-save), the previous store is returned with a warning.
+    """
+    store = json_codec.load(path)
+    if store.get("format") != FORMAT:
+        raise ValueError(f"{path}: not a {FORMAT} vocab store, rebuild it with vocab_store.py")
+    data_dir = Path(store["dataDir"])
+    if not data_dir.is_dir():
+        print(f"⚠️  Vocab store sources not found in {data_dir}, cannot check {path} is up to date")
+        return store
+    stale = stale_sources(store)
+    if stale:
+        print(f"🔄 Vocab store out of date ({len(stale)} changed: {', '.join(stale[:5])}), rebuilding {path}")
+        try:
+            store = build_store(find_vocab_sources(data_dir), data_dir)
+        except ValueError as e:
+            print(f"⚠️  Could not rebuild the vocab store, using the previous one: {e}")
+            return store
+        save_store(store, path)
+    return store
+
+
+def iter_store_files(store):
+    """Yield (source file name, items) so validators can report per source file"""
+    for file_name, (start, end) in store["files"].items():
+        yield file_name, store["items"][start:end]
+
+
+def get_by_id(store, item_id):
+    """Item with the given id, or None"""
+    offset = store["indexes"]["idToOffset"].get(item_id)
+    return None if offset is None else store["items"][offset]
+
+
+def get_by_word(store, word):
+    """All items for a word (case-insensitive)"""
+    return [get_by_id(store, item_id) for item_id in store["indexes"]["wordToIds"].get(word.lower(), [])]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the consolidated vocab store")
+    parser.add_argument("--out", type=Path, default=STORE_PATH,
+                        help=f"store file to write (default: scripts/build/{STORE_NAME})")
+    parser.add_argument("--pretty", action="store_true",
+                        help="indent the output instead of writing it minified")
+    args = parser.parse_args()
+
+    sources = find_vocab_sources()
+    store = build_store(sources)
+
+    save_store(store, args.out, args.pretty)
+
+    indexes = store["indexes"]
+    print(f"Merged {len(sources)} files, {len(store['items']):,} items → {args.out}")
+    print(f"  ids: {len(indexes['idToOffset']):,}, words: {len(indexes['wordToIds']):,}, "
+          f"levels: {len(indexes['levelToIds'])}, parts of speech: {len(indexes['posToIds'])}")
+
+
+if __name__ == "__main__":
+    main()